@@ -4,11 +4,10 @@ Addon: Cloudinary — Serviço de upload de imagens.
 Para usar, adicione 'cloudinary' ao pyproject.toml:
     dependencies = [..., "cloudinary>=1.36.0"]
 
-E copie este arquivo para app/cloudinary/service.py
+E copie este arquivo para app/cloudinary/service.py. O SDK só é importado no
+primeiro uso, para não pesar na inicialização dos workers.
 """
 
-import cloudinary
-import cloudinary.uploader
 from fastapi import HTTPException, UploadFile, status
 
 from app.common.errors import ERRORS
@@ -16,7 +15,9 @@ from app.core.config import settings
 
 
 def configure_cloudinary() -> None:
-    """Configura o Cloudinary. Chame no startup da aplicação."""
+    """Configura o Cloudinary. Chame no `lifespan` da aplicação (app/lifespan.py)."""
+    import cloudinary
+
     cloudinary.config(
         cloud_name=settings.CLOUDINARY_CLOUD_NAME,
         api_key=settings.CLOUDINARY_API_KEY,
@@ -39,12 +40,16 @@ async def upload_image(file: UploadFile, folder: str) -> dict:
     file_base64 = base64.b64encode(contents).decode("utf-8")
     data_uri = f"data:{file.content_type};base64,{file_base64}"
 
+    import cloudinary.uploader
+
     result = cloudinary.uploader.upload(data_uri, folder=folder, resource_type="image")
     return result
 
 
 async def delete_image(public_id: str) -> dict:
     """Deleta uma imagem do Cloudinary pelo public_id."""
+    import cloudinary.uploader
+
     return cloudinary.uploader.destroy(public_id)
 
 
@@ -64,4 +69,7 @@ async def delete_images(public_ids: list[str]) -> dict:
     """Deleta múltiplas imagens do Cloudinary."""
     if not public_ids:
         return {}
+
+    import cloudinary.api
+
     return cloudinary.api.delete_resources(public_ids)
@@ -0,0 +1,50 @@
+"""users token_version and refresh token HMAC digest
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-17 09:05:00.000000
+
+`token_version` revoga access tokens no modo stateless; `token_digest` guarda o
+HMAC-SHA256 do refresh token. Registros antigos mantêm só o `hashed_token`
+(bcrypt), que passa a ser opcional, e continuam válidos até expirarem.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0001a"
+down_revision: str | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Default constante: no Postgres 11+ não reescreve a tabela
+    op.add_column(
+        "users", sa.Column("token_version", sa.Integer(), server_default="0", nullable=False)
+    )
+    op.add_column("refresh_tokens", sa.Column("token_digest", sa.String(length=64), nullable=True))
+    op.alter_column("refresh_tokens", "hashed_token", existing_type=sa.String(), nullable=True)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_refresh_tokens_token_digest",
+            "refresh_tokens",
+            ["token_digest"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    # Sessões emitidas só com o digest não têm hash bcrypt: os usuários refazem o login
+    op.execute("DELETE FROM refresh_tokens WHERE hashed_token IS NULL")
+    op.alter_column("refresh_tokens", "hashed_token", existing_type=sa.String(), nullable=False)
+    op.drop_index("ix_refresh_tokens_token_digest", table_name="refresh_tokens")
+    op.drop_column("refresh_tokens", "token_digest")
+    op.drop_column("users", "token_version")
@@ -0,0 +1,47 @@
+"""users keyset pagination indexes
+
+Revision ID: 0002
+Revises: 0001a
+Create Date: 2026-10-17 09:10:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: str | None = "0001a"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Colunas ordenáveis de /users/paginated; cada índice usa `id` como desempate
+SORT_COLUMNS = ("created_at", "name", "email", "is_active", "role")
+
+
+def upgrade() -> None:
+    # CONCURRENTLY não roda dentro de transação e evita bloquear escritas na tabela
+    with op.get_context().autocommit_block():
+        for column in SORT_COLUMNS:
+            op.create_index(
+                f"ix_users_{column}_id",
+                "users",
+                [column, "id"],
+                postgresql_where=sa.text("deleted_at IS NULL"),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for column in SORT_COLUMNS:
+            op.drop_index(
+                f"ix_users_{column}_id",
+                table_name="users",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,80 @@
+"""users search indexes (pg_trgm and full-text)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 09:20:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TRIGRAM_COLUMNS = ("name", "email")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Coluna gerada: reescreve a tabela uma vez; em tabelas grandes rode em janela de manutenção
+    op.add_column(
+        "users",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(email, ''))",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+
+    with op.get_context().autocommit_block():
+        for column in TRIGRAM_COLUMNS:
+            op.create_index(
+                f"ix_users_{column}_trgm",
+                "users",
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_where=sa.text("deleted_at IS NULL"),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        op.create_index(
+            "ix_users_search_vector",
+            "users",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_search_vector",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        for column in TRIGRAM_COLUMNS:
+            op.drop_index(
+                f"ix_users_{column}_trgm",
+                table_name="users",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+    op.drop_column("users", "search_vector")
@@ -0,0 +1,155 @@
+"""refresh tokens expiry, indexes and optional partitioning
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 09:30:00.000000
+
+Particionamento mensal por `expires_at` (opcional):
+    alembic -x partition_refresh_tokens=true upgrade head
+
+Em uma tabela particionada a PK e as restrições de unicidade precisam incluir a
+chave de partição, então `jti` e `token_digest` passam a ter índices comuns. As
+partições dos meses seguintes são criadas na inicialização da aplicação e por
+`python -m app.cli.prune_tokens`; a partição DEFAULT recebe o que ficar fora delas,
+para que os logins não falhem se o job deixar de rodar.
+"""
+
+from collections.abc import Sequence
+from datetime import UTC, datetime
+
+import sqlalchemy as sa
+
+from alembic import context, op
+from app.core.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: str | None = "0003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+PARTITION_MONTHS_AHEAD = 3
+
+
+def _partition_requested() -> bool:
+    args = context.get_x_argument(as_dictionary=True)
+    return args.get("partition_refresh_tokens", "").lower() == "true"
+
+
+def _is_partitioned() -> bool:
+    if context.is_offline_mode():
+        return _partition_requested()
+    relkind = op.get_bind().scalar(
+        sa.text("SELECT relkind FROM pg_class WHERE oid = 'refresh_tokens'::regclass")
+    )
+    return relkind == "p"
+
+
+def _add_months(year: int, month: int, months: int) -> tuple[int, int]:
+    index = year * 12 + month - 1 + months
+    return index // 12, index % 12 + 1
+
+
+def _create_partitions(table: str) -> None:
+    now = datetime.now(UTC)
+    for offset in range(PARTITION_MONTHS_AHEAD + 1):
+        year, month = _add_months(now.year, now.month, offset)
+        next_year, next_month = _add_months(year, month, 1)
+        op.execute(
+            f"CREATE TABLE refresh_tokens_p{year}{month:02d} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{year}-{month:02d}-01') TO ('{next_year}-{next_month:02d}-01')"
+        )
+    op.execute(f"CREATE TABLE refresh_tokens_default PARTITION OF {table} DEFAULT")
+
+
+def _rebuild_table(partitioned: bool) -> None:
+    """Recria `refresh_tokens` como tabela particionada (ou comum) copiando os dados."""
+    partition_clause = " PARTITION BY RANGE (expires_at)" if partitioned else ""
+    op.execute(
+        "CREATE TABLE refresh_tokens_rebuild (LIKE refresh_tokens INCLUDING DEFAULTS)"
+        + partition_clause
+    )
+
+    if partitioned:
+        _create_partitions("refresh_tokens_rebuild")
+        # Apenas sessões ativas; as expiradas não teriam partição de destino
+        op.execute(
+            "INSERT INTO refresh_tokens_rebuild SELECT * FROM refresh_tokens "
+            "WHERE expires_at > now()"
+        )
+    else:
+        op.execute("INSERT INTO refresh_tokens_rebuild SELECT * FROM refresh_tokens")
+
+    op.drop_table("refresh_tokens")
+    op.rename_table("refresh_tokens_rebuild", "refresh_tokens")
+
+    if partitioned:
+        op.create_primary_key("refresh_tokens_pkey", "refresh_tokens", ["id", "expires_at"])
+        op.create_index("ix_refresh_tokens_jti", "refresh_tokens", ["jti"])
+        op.create_index("ix_refresh_tokens_token_digest", "refresh_tokens", ["token_digest"])
+    else:
+        op.create_primary_key("refresh_tokens_pkey", "refresh_tokens", ["id"])
+        op.create_unique_constraint("refresh_tokens_jti_key", "refresh_tokens", ["jti"])
+        op.create_index(
+            "ix_refresh_tokens_token_digest", "refresh_tokens", ["token_digest"], unique=True
+        )
+
+    op.create_foreign_key(
+        "refresh_tokens_user_id_fkey",
+        "refresh_tokens",
+        "users",
+        ["user_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_index("ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"])
+    op.create_index("ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"])
+
+
+def upgrade() -> None:
+    op.add_column(
+        "refresh_tokens", sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.execute(
+        "UPDATE refresh_tokens SET expires_at = created_at + "
+        f"interval '{settings.JWT_REFRESH_EXPIRATION_DAYS} days'"
+    )
+    op.alter_column("refresh_tokens", "expires_at", nullable=False)
+
+    if _partition_requested():
+        _rebuild_table(partitioned=True)
+        return
+
+    # Exclusões de usuários passam a remover os tokens no próprio banco
+    op.drop_constraint("refresh_tokens_user_id_fkey", "refresh_tokens", type_="foreignkey")
+    op.create_foreign_key(
+        "refresh_tokens_user_id_fkey",
+        "refresh_tokens",
+        "users",
+        ["user_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+    with op.get_context().autocommit_block():
+        for column in ("user_id", "expires_at"):
+            op.create_index(
+                f"ix_refresh_tokens_{column}",
+                "refresh_tokens",
+                [column],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    if _is_partitioned():
+        _rebuild_table(partitioned=False)
+
+    op.drop_index("ix_refresh_tokens_expires_at", table_name="refresh_tokens", if_exists=True)
+    op.drop_index("ix_refresh_tokens_user_id", table_name="refresh_tokens", if_exists=True)
+    op.drop_constraint("refresh_tokens_user_id_fkey", "refresh_tokens", type_="foreignkey")
+    op.create_foreign_key(
+        "refresh_tokens_user_id_fkey", "refresh_tokens", "users", ["user_id"], ["id"]
+    )
+    op.drop_column("refresh_tokens", "expires_at")
@@ -0,0 +1,4 @@
+import time
+
+# Início da importação da aplicação; base dos tempos reportados em app.lifespan
+STARTED_AT = time.perf_counter()
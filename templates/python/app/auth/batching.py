@@ -0,0 +1,115 @@
+import asyncio
+import contextlib
+import time
+
+from sqlalchemy import insert
+
+from app.auth.models import RefreshToken
+from app.core.config import settings
+from app.core.database import async_session_factory
+
+
+class RefreshTokenWriteBatcher:
+    """
+    Agrupa inserts concorrentes de refresh tokens em um único INSERT multi-linha.
+
+    O primeiro insert abre uma janela de `window_ms`; tudo que chegar nela (até
+    `max_batch` linhas) é gravado em uma transação própria, com um commit só. Cada
+    chamador aguarda o commit do lote que contém a sua linha, então ao retornar o
+    token já está persistido.
+    """
+
+    def __init__(self, window_ms: float, max_batch: int):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._pending: list[tuple[dict, asyncio.Future]] = []
+        self._batch_full: asyncio.Event | None = None
+        self._collector: asyncio.Task | None = None
+        self._flushes: set[asyncio.Task] = set()
+        self.batches = 0
+        self.rows = 0
+        self.failed_batches = 0
+        self.flush_time_total = 0.0
+        self.flush_time_max = 0.0
+        self._started_at: float | None = None
+
+    async def add(self, values: dict) -> None:
+        """Enfileira a linha e aguarda o commit do lote em que ela for gravada."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((values, future))
+
+        if self._collector is None or self._collector.done():
+            self._batch_full = asyncio.Event()
+            self._collector = loop.create_task(self._collect())
+        if len(self._pending) >= self.max_batch:
+            self._batch_full.set()
+
+        await future
+
+    async def _collect(self) -> None:
+        while self._pending:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._batch_full.wait(), timeout=self.window)
+
+            batch = self._pending[: self.max_batch]
+            self._pending = self._pending[self.max_batch :]
+            if len(self._pending) < self.max_batch:
+                self._batch_full.clear()
+
+            # Os lotes são gravados em paralelo; a janela seguinte já começa a coletar
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list[tuple[dict, asyncio.Future]]) -> None:
+        started_at = time.perf_counter()
+        try:
+            async with async_session_factory() as session:
+                await session.execute(insert(RefreshToken), [values for values, _ in batch])
+                await session.commit()
+        except Exception as exc:
+            self.failed_batches += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        elapsed = time.perf_counter() - started_at
+        if self._started_at is None:
+            self._started_at = started_at
+        self.batches += 1
+        self.rows += len(batch)
+        self.flush_time_total += elapsed
+        self.flush_time_max = max(self.flush_time_max, elapsed)
+
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
+
+    async def close(self) -> None:
+        """Grava o que estiver pendente; usado no desligamento da aplicação."""
+        if self._collector is not None:
+            await self._collector
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def stats(self) -> dict[str, float]:
+        batches = self.batches or 1
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        return {
+            "pending": len(self._pending),
+            "batches": self.batches,
+            "rows": self.rows,
+            "failed_batches": self.failed_batches,
+            "avg_batch_size": self.rows / batches,
+            "flush_time_avg_ms": self.flush_time_total / batches * 1000,
+            "flush_time_max_ms": self.flush_time_max * 1000,
+            "rows_per_second": self.rows / elapsed if elapsed else 0.0,
+        }
+
+
+refresh_token_batcher = RefreshTokenWriteBatcher(
+    window_ms=settings.REFRESH_TOKEN_BATCH_WINDOW_MS,
+    max_batch=settings.REFRESH_TOKEN_BATCH_MAX_SIZE,
+)
@@ -0,0 +1,38 @@
+import uuid
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.auth.schemas import CurrentUser
+from app.common.cache import TTLCache
+from app.core.config import settings
+
+_PENDING_KEY = "invalidated_user_ids"
+
+user_cache: TTLCache[CurrentUser] = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_user(db: AsyncSession, user_id: uuid.UUID) -> None:
+    """
+    Remove o usuário do cache.
+
+    A remoção acontece imediatamente e de novo após o commit da sessão, para que
+    uma requisição concorrente não recoloque no cache o estado anterior à escrita.
+    """
+    user_cache.pop(user_id)
+    db.info.setdefault(_PENDING_KEY, set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        user_cache.pop(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -6,27 +6,43 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth.cache import user_cache
 from app.auth.enums import Role
+from app.auth.revocation import token_denylist
+from app.auth.schemas import CurrentUser
 from app.common.errors import ERRORS
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.metrics import timed_jwt
 
 security = HTTPBearer()
 
 
-def create_access_token(user_id: uuid.UUID, email: str, role: str) -> str:
+@timed_jwt("encode_access")
+def create_access_token(
+    user_id: uuid.UUID,
+    email: str,
+    role: str,
+    is_active: bool = True,
+    token_version: int = 0,
+) -> str:
     """Cria um JWT access token."""
     expire = datetime.now(UTC) + timedelta(minutes=settings.JWT_EXPIRATION_MINUTES)
     payload = {
         "sub": str(user_id),
         "email": email,
         "role": role,
+        "is_active": is_active,
+        "ver": token_version,
         "exp": expire,
     }
     return jwt.encode(payload, settings.JWT_SECRET, algorithm="HS256")
 
 
-def create_refresh_token(user_id: uuid.UUID, email: str, role: str, jti: str) -> str:
+@timed_jwt("encode_refresh")
+def create_refresh_token(
+    user_id: uuid.UUID, email: str, role: str, jti: str, token_version: int = 0
+) -> str:
     """Cria um JWT refresh token."""
     expire = datetime.now(UTC) + timedelta(days=settings.JWT_REFRESH_EXPIRATION_DAYS)
     payload = {
@@ -34,11 +50,13 @@ def create_refresh_token(user_id: uuid.UUID, email: str, role: str, jti: str) ->
         "email": email,
         "role": role,
         "jti": jti,
+        "ver": token_version,
         "exp": expire,
     }
     return jwt.encode(payload, settings.JWT_REFRESH_SECRET, algorithm="HS256")
 
 
+@timed_jwt("decode_access")
 def decode_access_token(token: str) -> dict:
     """Decodifica e valida um access token."""
     try:
@@ -50,6 +68,7 @@ def decode_access_token(token: str) -> dict:
         ) from exc
 
 
+@timed_jwt("decode_refresh")
 def decode_refresh_token(token: str) -> dict:
     """Decodifica e valida um refresh token."""
     try:
@@ -64,10 +83,8 @@ def decode_refresh_token(token: str) -> dict:
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
-):
+) -> CurrentUser:
     """Dependency que extrai e valida o usuário atual do token JWT."""
-    from app.user.models import User
-
     payload = decode_access_token(credentials.credentials)
     user_id = payload.get("sub")
 
@@ -77,7 +94,30 @@ async def get_current_user(
             detail=ERRORS["AUTH"]["INVALID_TOKEN"],
         )
 
-    user = await db.get(User, uuid.UUID(user_id))
+    user_uuid = uuid.UUID(user_id)
+
+    if settings.AUTH_STATELESS and "ver" in payload:
+        return await _current_user_from_claims(db, user_uuid, payload)
+
+    current_user = user_cache.get(user_uuid)
+    if current_user is None:
+        current_user = await _load_current_user(db, user_uuid)
+        user_cache.set(user_uuid, current_user)
+
+    if payload.get("ver", current_user.token_version) < current_user.token_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ERRORS["AUTH"]["TOKEN_REVOKED"],
+        )
+
+    return current_user
+
+
+async def _load_current_user(db: AsyncSession, user_id: uuid.UUID) -> CurrentUser:
+    """Busca o usuário no banco e valida se ele pode se autenticar."""
+    from app.user.models import User
+
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -97,7 +137,33 @@ async def get_current_user(
             detail=ERRORS["AUTH"]["ACCOUNT_DISABLED"],
         )
 
-    return user
+    return CurrentUser.model_validate(user)
+
+
+async def _current_user_from_claims(
+    db: AsyncSession, user_id: uuid.UUID, payload: dict
+) -> CurrentUser:
+    """Monta o usuário atual a partir das claims assinadas, sem consultar a tabela users."""
+    if not payload.get("is_active", False):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ERRORS["AUTH"]["ACCOUNT_DISABLED"],
+        )
+
+    await token_denylist.sync(db)
+    if token_denylist.is_revoked(user_id, payload["ver"]):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ERRORS["AUTH"]["TOKEN_REVOKED"],
+        )
+
+    return CurrentUser(
+        id=user_id,
+        email=payload.get("email", ""),
+        role=payload.get("role"),
+        is_active=True,
+        token_version=payload["ver"],
+    )
 
 
 def require_role(*roles: Role):
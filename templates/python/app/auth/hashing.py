@@ -0,0 +1,190 @@
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.common.errors import ERRORS
+from app.core.config import settings
+from app.core.metrics import record_password_hash, record_password_hash_rejected
+
+R = TypeVar("R")
+
+SUPPORTED_SCHEMES = ("argon2", "bcrypt")
+
+
+def build_password_context(
+    scheme: str,
+    bcrypt_rounds: int,
+    argon2_time_cost: int,
+    argon2_memory_cost: int,
+    argon2_parallelism: int,
+) -> CryptContext:
+    """
+    Cria o contexto de hashing com `scheme` como padrão.
+
+    Os demais esquemas suportados continuam aceitos na verificação, mas são marcados
+    como obsoletos. O custo é fixado (min = max = padrão) para que hashes com custo
+    diferente do configurado também sejam refeitos no próximo login.
+    """
+    if scheme not in SUPPORTED_SCHEMES:
+        raise ValueError(f"Esquema de hashing não suportado: {scheme}")
+
+    return CryptContext(
+        schemes=[scheme, *(s for s in SUPPORTED_SCHEMES if s != scheme)],
+        default=scheme,
+        deprecated="auto",
+        bcrypt__default_rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        bcrypt__max_rounds=bcrypt_rounds,
+        argon2__type="ID",
+        argon2__default_rounds=argon2_time_cost,
+        argon2__min_rounds=argon2_time_cost,
+        argon2__max_rounds=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+pwd_context = build_password_context(
+    scheme=settings.PASSWORD_HASH_SCHEME,
+    bcrypt_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    argon2_time_cost=settings.PASSWORD_ARGON2_TIME_COST,
+    argon2_memory_cost=settings.PASSWORD_ARGON2_MEMORY_COST,
+    argon2_parallelism=settings.PASSWORD_ARGON2_PARALLELISM,
+)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verifica a senha e, se o hash estiver obsoleto, retorna um novo hash."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def load_hash_backend() -> None:
+    """Carrega o backend do esquema padrão (o passlib só o faz no primeiro uso)."""
+    pwd_context.handler().get_backend()
+
+
+class PasswordHashExecutor:
+    """
+    Pool de threads dedicado ao hashing de senhas.
+
+    O bcrypt e o argon2 liberam o GIL durante o cálculo, então threads bastam para
+    usar vários núcleos sem bloquear o event loop. Quando há mais de `max_queue`
+    tarefas aguardando um worker, novas chamadas falham na hora com 503.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: ThreadPoolExecutor | None = None
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.hash_time_total = 0.0
+        self.hash_time_max = 0.0
+
+    async def run(self, fn: Callable[..., R], *args) -> R:
+        if self._in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            record_password_hash_rejected()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=ERRORS["AUTH"]["HASHER_BUSY"],
+                headers={"Retry-After": "1"},
+            )
+
+        submitted_at = time.perf_counter()
+
+        def timed() -> tuple[R, float, float]:
+            started_at = time.perf_counter()
+            result = fn(*args)
+            return result, started_at - submitted_at, time.perf_counter() - started_at
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, queue_wait, hash_time = await loop.run_in_executor(self._get_executor(), timed)
+        finally:
+            self._in_flight -= 1
+
+        self.completed += 1
+        self.queue_wait_total += queue_wait
+        self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+        self.hash_time_total += hash_time
+        self.hash_time_max = max(self.hash_time_max, hash_time)
+        record_password_hash(fn.__name__, queue_wait, hash_time)
+        return result
+
+    async def warm_up(self) -> None:
+        """Cria os threads e carrega o backend do esquema padrão antes do primeiro login."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(
+            *(loop.run_in_executor(executor, load_hash_backend) for _ in range(self.max_workers))
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, float]:
+        completed = self.completed or 1
+        return {
+            "workers": self.max_workers,
+            "in_flight": self._in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_wait_avg_ms": self.queue_wait_total / completed * 1000,
+            "queue_wait_max_ms": self.queue_wait_max * 1000,
+            "hash_time_avg_ms": self.hash_time_total / completed * 1000,
+            "hash_time_max_ms": self.hash_time_max * 1000,
+        }
+
+
+password_hash_executor = PasswordHashExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Versão awaitable de `verify_password`, executada fora do event loop."""
+    return await password_hash_executor.run(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Versão awaitable de `verify_and_update_password`, executada fora do event loop."""
+    return await password_hash_executor.run(
+        verify_and_update_password, plain_password, hashed_password
+    )
+
+
+async def hash_password_async(password: str) -> str:
+    """Versão awaitable de `hash_password`, executada fora do event loop."""
+    return await password_hash_executor.run(hash_password, password)
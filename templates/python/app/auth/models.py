@@ -1,4 +1,6 @@
-from sqlalchemy import Boolean, Column, ForeignKey, String
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -10,9 +12,20 @@ class RefreshToken(BaseModel):
 
     __tablename__ = "refresh_tokens"
 
+    # Com o particionamento da migration 0004, a PK passa a ser (id, expires_at) e
+    # `jti`/`token_digest` têm índices não únicos: o Postgres exige a chave de
+    # partição em toda restrição de unicidade. O `alembic revision --autogenerate`
+    # acusa essa diferença; descarte-a nas migrations geradas.
     jti: str = Column(String, unique=True, nullable=False)
-    hashed_token: str = Column(String, nullable=False)
+    # HMAC-SHA256 do token; `hashed_token` (bcrypt) só existe em registros legados
+    token_digest: str | None = Column(String(64), unique=True, nullable=True, index=True)
+    hashed_token: str | None = Column(String, nullable=True)
     is_revoked: bool = Column(Boolean, default=False, nullable=False)
+    # Mesmo vencimento do JWT; base da limpeza (app.cli.prune_tokens) e do
+    # particionamento opcional por mês
+    expires_at: datetime = Column(DateTime(timezone=True), nullable=False, index=True)
 
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     user = relationship("User", back_populates="refresh_tokens")
@@ -0,0 +1,106 @@
+"""
+Partições mensais de `refresh_tokens` (migration 0004 com
+`-x partition_refresh_tokens=true`), por mês de expiração, mais a partição DEFAULT
+para os tokens de meses ainda sem partição.
+"""
+
+import re
+from datetime import UTC, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.database import engine
+
+PARTITION_NAME = re.compile(r"^refresh_tokens_p(\d{4})(\d{2})$")
+DEFAULT_PARTITION = "refresh_tokens_default"
+PARTITION_MONTHS_AHEAD = 3
+
+
+def add_months(year: int, month: int, months: int) -> tuple[int, int]:
+    index = year * 12 + month - 1 + months
+    return index // 12, index % 12 + 1
+
+
+async def is_partitioned(conn: AsyncConnection) -> bool:
+    relkind = await conn.scalar(
+        text("SELECT relkind FROM pg_class WHERE oid = 'refresh_tokens'::regclass")
+    )
+    return relkind == "p"
+
+
+async def list_partitions(conn: AsyncConnection) -> list[str]:
+    result = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'refresh_tokens'::regclass"
+        )
+    )
+    return list(result.scalars().all())
+
+
+async def create_partitions(conn: AsyncConnection, months_ahead: int) -> list[str]:
+    """Cria as partições do mês atual e dos `months_ahead` meses seguintes."""
+    # Serializa workers e o job, que podem criar as mesmas partições ao mesmo tempo
+    await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('refresh_tokens_partitions'))"))
+    existing = set(await list_partitions(conn))
+    now = datetime.now(UTC)
+    created = []
+
+    for offset in range(months_ahead + 1):
+        year, month = add_months(now.year, now.month, offset)
+        name = f"refresh_tokens_p{year}{month:02d}"
+        if name in existing:
+            continue
+        next_year, next_month = add_months(year, month, 1)
+        start, end = f"{year}-{month:02d}-01", f"{next_year}-{next_month:02d}-01"
+        bounds = f"FROM ('{start}') TO ('{end}')"
+        if DEFAULT_PARTITION not in existing:
+            await conn.execute(
+                text(f"CREATE TABLE {name} PARTITION OF refresh_tokens FOR VALUES {bounds}")
+            )
+        else:
+            # O ATTACH falha se a DEFAULT tiver linhas do intervalo: elas vão antes para a nova
+            await conn.execute(
+                text(f"CREATE TABLE {name} (LIKE refresh_tokens INCLUDING DEFAULTS)")
+            )
+            await conn.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                    f"WHERE expires_at >= '{start}' AND expires_at < '{end}' RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                )
+            )
+            await conn.execute(
+                text(f"ALTER TABLE refresh_tokens ATTACH PARTITION {name} FOR VALUES {bounds}")
+            )
+        created.append(name)
+
+    return created
+
+
+async def ensure_partitions(months_ahead: int = PARTITION_MONTHS_AHEAD) -> list[str]:
+    """Cria as partições que faltam, se a tabela for particionada; usado na inicialização."""
+    async with engine.begin() as conn:
+        if not await is_partitioned(conn):
+            return []
+        return await create_partitions(conn, months_ahead)
+
+
+async def drop_expired_partitions(conn: AsyncConnection) -> list[str]:
+    """Descarta partições cujo mês inteiro já venceu."""
+    now = datetime.now(UTC)
+    dropped = []
+
+    for name in await list_partitions(conn):
+        match = PARTITION_NAME.match(name)
+        if not match:
+            continue
+        upper_year, upper_month = add_months(int(match[1]), int(match[2]), 1)
+        if datetime(upper_year, upper_month, 1, tzinfo=UTC) > now:
+            continue
+        await conn.execute(text(f"ALTER TABLE refresh_tokens DETACH PARTITION {name}"))
+        await conn.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+
+    return dropped
@@ -0,0 +1,304 @@
+"""
+Limite de requisições nas rotas de autenticação, contra força bruta de senhas e
+contra o esgotamento de CPU pelo hashing.
+
+Cada limite é um token bucket: `"10/minute"` permite rajadas de até 10 requisições
+e repõe uma a cada 6 s. As rotas conferem os limites por IP, por e-mail (login) ou
+usuário (troca de senha) e o global antes de qualquer query ou hash; acima do
+limite, respondem 429 com `Retry-After`.
+
+Backends (`RATE_LIMIT_BACKEND`):
+- "memory": no próprio processo; cada worker tem seus próprios buckets.
+- "sqlite": arquivo SQLite compartilhado pelos workers do mesmo host.
+
+Atrás de um proxy, rode o uvicorn com `--proxy-headers --forwarded-allow-ips=<ip do proxy>`
+para que o IP do cliente venha do `X-Forwarded-For`.
+"""
+
+import asyncio
+import hashlib
+import math
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import JWTError, jwt
+
+from app.auth.dependencies import security
+from app.auth.schemas import LoginRequest
+from app.common.errors import ERRORS
+from app.core.config import settings
+from app.core.metrics import record_rate_limited
+
+SUPPORTED_BACKENDS = ("memory", "sqlite")
+PERIODS = {"second": 1, "minute": 60, "hour": 3600}
+# Intervalo da remoção dos buckets já cheios, que equivalem a buckets inexistentes
+PRUNE_INTERVAL_SECONDS = 60
+
+
+@dataclass(frozen=True, slots=True)
+class Rate:
+    capacity: int
+    period: float
+
+    @property
+    def per_second(self) -> float:
+        return self.capacity / self.period
+
+    @classmethod
+    def parse(cls, value: str) -> "Rate | None":
+        """Lê `"quantidade/período"` (second, minute ou hour); vazio desativa o limite."""
+        if not value.strip():
+            return None
+        amount, _, period = value.partition("/")
+        try:
+            rate = cls(int(amount), PERIODS[period.strip()])
+        except (KeyError, ValueError) as exc:
+            raise ValueError(f"Limite de requisições inválido: {value!r}") from exc
+        return rate if rate.capacity > 0 else None
+
+
+Limit = tuple[str, Rate]
+
+
+def _refill(
+    states: list[tuple[float, float] | None], limits: list[Limit], now: float
+) -> tuple[list[float], list[float]]:
+    """Fichas disponíveis em cada bucket e a espera até a próxima (0 se há ficha)."""
+    available, waits = [], []
+    for state, (_, rate) in zip(states, limits, strict=True):
+        tokens = rate.capacity
+        if state is not None:
+            tokens = min(rate.capacity, state[0] + (now - state[1]) * rate.per_second)
+        available.append(tokens)
+        waits.append(0.0 if tokens >= 1 else (1 - tokens) / rate.per_second)
+    return available, waits
+
+
+def _full_at(tokens: float, rate: Rate, now: float) -> float:
+    return now + (rate.capacity - tokens) / rate.per_second
+
+
+class RateLimitBackend(ABC):
+    """Armazenamento dos buckets."""
+
+    @abstractmethod
+    async def acquire(self, limits: list[Limit]) -> list[float]:
+        """
+        Consome uma ficha de cada bucket, de forma atômica. Se algum estiver vazio,
+        nada é consumido; retorna a espera em segundos de cada bucket (0 se havia ficha).
+        """
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Buckets no próprio processo; o event loop garante a atomicidade."""
+
+    def __init__(self):
+        # chave -> (fichas, atualizado em, cheio em)
+        self._buckets: dict[str, tuple[float, float, float]] = {}
+        self._next_prune_at = 0.0
+
+    async def acquire(self, limits: list[Limit]) -> list[float]:
+        now = time.monotonic()
+        available, waits = _refill([self._buckets.get(key) for key, _ in limits], limits, now)
+        if any(waits):
+            return waits
+
+        for (key, rate), tokens in zip(limits, available, strict=True):
+            self._buckets[key] = (tokens - 1, now, _full_at(tokens - 1, rate, now))
+        if now >= self._next_prune_at:
+            self._prune(now)
+        return waits
+
+    def _prune(self, now: float) -> None:
+        self._next_prune_at = now + PRUNE_INTERVAL_SECONDS
+        for key in [key for key, bucket in self._buckets.items() if bucket[2] <= now]:
+            del self._buckets[key]
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """
+    Buckets em um arquivo SQLite, compartilhados pelos processos do mesmo host.
+
+    As transações rodam em um thread dedicado, fora do event loop; `BEGIN IMMEDIATE`
+    serializa os workers, e o modo WAL mantém cada commit na ordem de microssegundos.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rate-limit")
+        self._conn: sqlite3.Connection | None = None
+        self._next_prune_at = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, "
+            "updated_at REAL NOT NULL, full_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_rate_limit_buckets_full_at "
+            "ON rate_limit_buckets (full_at)"
+        )
+        return conn
+
+    def _acquire(self, limits: list[Limit]) -> list[float]:
+        if self._conn is None:
+            self._conn = self._connect()
+        conn = self._conn
+        keys = [key for key, _ in limits]
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Relógio de parede: os buckets são comparados entre processos
+            now = time.time()
+            rows = conn.execute(
+                "SELECT key, tokens, updated_at FROM rate_limit_buckets "
+                f"WHERE key IN ({', '.join('?' * len(keys))})",
+                keys,
+            )
+            stored = {key: (tokens, updated_at) for key, tokens, updated_at in rows}
+            available, waits = _refill([stored.get(key) for key in keys], limits, now)
+            if not any(waits):
+                conn.executemany(
+                    "INSERT INTO rate_limit_buckets (key, tokens, updated_at, full_at) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                    "tokens = excluded.tokens, updated_at = excluded.updated_at, "
+                    "full_at = excluded.full_at",
+                    [
+                        (key, tokens - 1, now, _full_at(tokens - 1, rate, now))
+                        for (key, rate), tokens in zip(limits, available, strict=True)
+                    ],
+                )
+                if now >= self._next_prune_at:
+                    self._next_prune_at = now + PRUNE_INTERVAL_SECONDS
+                    conn.execute("DELETE FROM rate_limit_buckets WHERE full_at <= ?", (now,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return waits
+
+    async def acquire(self, limits: list[Limit]) -> list[float]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._acquire, limits)
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._close)
+        self._executor.shutdown()
+
+
+class RateLimiter:
+    """Confere os limites de uma requisição e conta as recusas por escopo."""
+
+    def __init__(self, backend: RateLimitBackend):
+        self.backend = backend
+        self.rejected: Counter[str] = Counter()
+        self.rates = {
+            "login_ip": Rate.parse(settings.RATE_LIMIT_LOGIN_PER_IP),
+            "login_email": Rate.parse(settings.RATE_LIMIT_LOGIN_PER_EMAIL),
+            "refresh_ip": Rate.parse(settings.RATE_LIMIT_REFRESH_PER_IP),
+            "change_password_ip": Rate.parse(settings.RATE_LIMIT_CHANGE_PASSWORD_PER_IP),
+            "change_password_user": Rate.parse(settings.RATE_LIMIT_CHANGE_PASSWORD_PER_USER),
+            "global": Rate.parse(settings.RATE_LIMIT_GLOBAL),
+        }
+
+    async def check(self, *buckets: tuple[str, str]) -> None:
+        """Consome uma ficha de cada `(escopo, identificador)` ou levanta 429."""
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        scopes, limits = [], []
+        for scope, identifier in (*buckets, ("global", "")):
+            rate = self.rates[scope]
+            if rate is not None:
+                scopes.append(scope)
+                limits.append((f"{scope}:{identifier}", rate))
+        if not limits:
+            return
+
+        waits = await self.backend.acquire(limits)
+        if not any(waits):
+            return
+
+        # O escopo mais específico que recusou, na ordem em que foram passados
+        scope = next(scope for scope, wait in zip(scopes, waits, strict=True) if wait)
+        self.rejected[scope] += 1
+        record_rate_limited(scope)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=ERRORS["AUTH"]["TOO_MANY_REQUESTS"],
+            headers={"Retry-After": str(math.ceil(max(waits)))},
+        )
+
+    def stats(self) -> dict:
+        return {
+            "enabled": settings.RATE_LIMIT_ENABLED,
+            "backend": settings.RATE_LIMIT_BACKEND,
+            "rejected": dict(self.rejected),
+        }
+
+    async def close(self) -> None:
+        if isinstance(self.backend, SQLiteRateLimitBackend):
+            await self.backend.close()
+
+
+def create_rate_limiter() -> RateLimiter:
+    """Cria o limitador com o backend configurado em `RATE_LIMIT_BACKEND`."""
+    backend = settings.RATE_LIMIT_BACKEND
+    if backend not in SUPPORTED_BACKENDS:
+        raise ValueError(f"Backend de limite de requisições não suportado: {backend}")
+    if backend == "sqlite":
+        return RateLimiter(SQLiteRateLimitBackend(settings.RATE_LIMIT_SQLITE_PATH))
+    return RateLimiter(MemoryRateLimitBackend())
+
+
+rate_limiter = create_rate_limiter()
+
+
+def _client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def _email_key(email: str) -> str:
+    # Digest em vez do e-mail, para não gravar dados pessoais no backend
+    return hashlib.blake2b(email.strip().lower().encode(), digest_size=16).hexdigest()
+
+
+async def limit_login(request: Request, data: LoginRequest) -> None:
+    await rate_limiter.check(
+        ("login_ip", _client_ip(request)), ("login_email", _email_key(data.email))
+    )
+
+
+async def limit_refresh(request: Request) -> None:
+    await rate_limiter.check(("refresh_ip", _client_ip(request)))
+
+
+async def limit_change_password(
+    request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> None:
+    buckets = [("change_password_ip", _client_ip(request))]
+    try:
+        # Sem verificar a assinatura: a claim só escolhe o bucket, e o token é
+        # validado logo depois por get_current_user
+        user_id = jwt.get_unverified_claims(credentials.credentials).get("sub")
+    except JWTError:
+        user_id = None
+    if user_id:
+        buckets.append(("change_password_user", str(user_id)))
+    await rate_limiter.check(*buckets)
@@ -0,0 +1,108 @@
+import asyncio
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.auth.cache import invalidate_user
+from app.core.config import settings
+
+_PENDING_KEY = "revoked_token_versions"
+
+
+class TokenVersionDenylist:
+    """
+    Denylist em memória de `token_version` por usuário.
+
+    Guarda, para cada usuário revogado recentemente, a menor versão de token ainda
+    válida. Revogações feitas neste processo valem na hora; as de outros nós são
+    lidas do banco a cada `sync_seconds`. Entradas mais antigas que a validade do
+    access token são descartadas, pois todo token anterior a elas já expirou.
+    """
+
+    def __init__(self, sync_seconds: float, retention_seconds: float):
+        self.sync_seconds = sync_seconds
+        self.retention_seconds = retention_seconds
+        self._versions: dict[uuid.UUID, tuple[int, float]] = {}
+        self._synced_until: datetime | None = None
+        self._next_sync_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def record(self, user_id: uuid.UUID, version: int) -> None:
+        current = self._versions.get(user_id)
+        if current is None or version >= current[0]:
+            self._versions[user_id] = (version, time.monotonic())
+
+    def is_revoked(self, user_id: uuid.UUID, version: int) -> bool:
+        entry = self._versions.get(user_id)
+        return entry is not None and version < entry[0]
+
+    async def sync(self, db: AsyncSession) -> None:
+        """Atualiza a denylist com as revogações feitas por outros nós."""
+        from app.user.models import User
+
+        if time.monotonic() < self._next_sync_at or self._lock.locked():
+            return
+
+        async with self._lock:
+            now = datetime.now(UTC)
+            # Margem para compensar diferença de relógio entre a API e o banco
+            margin = timedelta(seconds=self.sync_seconds * 2)
+            since = self._synced_until or now - timedelta(seconds=self.retention_seconds)
+
+            stmt = select(User.id, User.token_version).where(
+                User.updated_at >= since - margin,
+                User.token_version > 0,
+            )
+            result = await db.execute(stmt)
+            for user_id, version in result.all():
+                self.record(user_id, version)
+
+            self._prune()
+            self._synced_until = now
+            self._next_sync_at = time.monotonic() + self.sync_seconds
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.retention_seconds
+        for user_id, (_, recorded_at) in list(self._versions.items()):
+            if recorded_at < cutoff:
+                del self._versions[user_id]
+
+
+token_denylist = TokenVersionDenylist(
+    sync_seconds=settings.TOKEN_DENYLIST_SYNC_SECONDS,
+    retention_seconds=settings.JWT_EXPIRATION_MINUTES * 60,
+)
+
+
+def revoke_user_tokens(db: AsyncSession, user) -> None:
+    """
+    Incrementa o `token_version` do usuário, invalidando todos os tokens já emitidos.
+
+    A denylist local só é atualizada após o commit da sessão.
+    """
+    user.token_version = (user.token_version or 0) + 1
+    record_token_version(db, user)
+
+
+def record_token_version(db: AsyncSession, user) -> None:
+    """
+    Propaga o `token_version` atual do usuário (já incrementado no banco) para o
+    cache e, após o commit, para a denylist local.
+    """
+    invalidate_user(db, user.id)
+    db.info.setdefault(_PENDING_KEY, {})[user.id] = user.token_version
+
+
+@event.listens_for(Session, "after_commit")
+def _record_after_commit(session: Session) -> None:
+    for user_id, version in session.info.pop(_PENDING_KEY, {}).items():
+        token_denylist.record(user_id, version)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -3,15 +3,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth import service as auth_service
 from app.auth.dependencies import get_current_user
+from app.auth.rate_limit import limit_change_password, limit_login, limit_refresh
 from app.auth.schemas import (
     ChangePasswordRequest,
+    CurrentUser,
     LoginRequest,
     LoginResponse,
     MessageResponse,
     RefreshTokenRequest,
 )
 from app.core.database import get_db
-from app.user.models import User
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -20,7 +21,11 @@ router = APIRouter(prefix="/auth", tags=["auth"])
     "/login",
     response_model=LoginResponse,
     summary="Autentica um usuário",
-    responses={200: {"description": "Usuário autenticado com sucesso."}},
+    responses={
+        200: {"description": "Usuário autenticado com sucesso."},
+        429: {"description": "Muitas tentativas; aguarde o tempo indicado em Retry-After."},
+    },
+    dependencies=[Depends(limit_login)],
 )
 async def login(data: LoginRequest, db: AsyncSession = Depends(get_db)):
     return await auth_service.login(db, data.email, data.password)
@@ -37,6 +42,19 @@ async def logout(data: RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
     return {"message": "Logout realizado com sucesso."}
 
 
+@router.post(
+    "/logout-all",
+    response_model=MessageResponse,
+    summary="Encerra todas as sessões do usuário logado",
+    responses={200: {"description": "Sessões encerradas com sucesso."}},
+)
+async def logout_all(
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    return await auth_service.logout_all(db, current_user.id)
+
+
 @router.post(
     "/refresh",
     response_model=LoginResponse,
@@ -44,7 +62,9 @@ async def logout(data: RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
     responses={
         200: {"description": "Tokens atualizados com sucesso."},
         401: {"description": "O refresh token é inválido ou expirou."},
+        429: {"description": "Muitas tentativas; aguarde o tempo indicado em Retry-After."},
     },
+    dependencies=[Depends(limit_refresh)],
 )
 async def refresh_tokens(data: RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
     return await auth_service.refresh_tokens(db, data.refresh_token)
@@ -58,11 +78,13 @@ async def refresh_tokens(data: RefreshTokenRequest, db: AsyncSession = Depends(g
         200: {"description": "Senha alterada com sucesso."},
         401: {"description": "Não autorizado."},
         400: {"description": "Requisição inválida."},
+        429: {"description": "Muitas tentativas; aguarde o tempo indicado em Retry-After."},
     },
+    dependencies=[Depends(limit_change_password)],
 )
 async def change_password(
     data: ChangePasswordRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     return await auth_service.change_password(db, current_user.id, data)
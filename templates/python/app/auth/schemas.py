@@ -6,13 +6,11 @@ from app.auth.enums import Role
 
 
 class LoginRequest(BaseModel):
-
     email: EmailStr
     password: str
 
 
 class LoginResponse(BaseModel):
-
     access_token: str
     refresh_token: str
     expires_in: int
@@ -20,15 +18,11 @@ class LoginResponse(BaseModel):
     user: "UserOut"
 
 
-
 class RefreshTokenRequest(BaseModel):
-
     refresh_token: str
 
 
-
 class ChangePasswordRequest(BaseModel):
-
     old_password: str
     new_password: str = Field(..., min_length=8)
 
@@ -54,5 +48,17 @@ class UserOut(BaseModel):
     must_change_password: bool
 
 
+class CurrentUser(BaseModel):
+    """Usuário autenticado da requisição (snapshot imutável, seguro para cache)."""
+
+    model_config = {"from_attributes": True, "frozen": True}
+
+    id: uuid.UUID
+    email: str
+    role: Role
+    is_active: bool
+    token_version: int = 0
+
+
 # Resolve forward reference
 LoginResponse.model_rebuild()
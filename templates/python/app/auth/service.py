@@ -1,7 +1,9 @@
+import hashlib
+import hmac
 import uuid
+from datetime import UTC, datetime, timedelta
 
 from fastapi import HTTPException, status
-from passlib.context import CryptContext
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -10,21 +12,40 @@ from app.auth.dependencies import (
     create_refresh_token,
     decode_refresh_token,
 )
-from app.auth.models import RefreshToken
+from app.auth.hashing import (
+    hash_password_async,
+    verify_and_update_password_async,
+    verify_password_async,
+)
+from app.auth.revocation import revoke_user_tokens
 from app.auth.schemas import ChangePasswordRequest, LoginResponse, MessageResponse, UserOut
+from app.auth.token_store import RefreshTokenRecord, get_refresh_token_store
 from app.common.errors import ERRORS
 from app.core.config import settings
 from app.user.models import User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+def digest_refresh_token(refresh_token: str) -> str:
+    """
+    Digest HMAC-SHA256 do refresh token.
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    O token já é um JWT aleatório de alta entropia, então não precisa do custo de
+    key stretching do bcrypt; o HMAC com chave do servidor basta para o armazenamento.
+    """
+    return hmac.new(
+        settings.JWT_REFRESH_DIGEST_SECRET.encode(),
+        refresh_token.encode(),
+        hashlib.sha256,
+    ).hexdigest()
 
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+async def verify_legacy_refresh_token(refresh_token: str, record: RefreshTokenRecord) -> bool:
+    """Registros legados (bcrypt, sem digest) continuam aceitos até expirarem."""
+    if record.token_digest is not None:
+        return True
+    return record.hashed_token is not None and await verify_password_async(
+        refresh_token, record.hashed_token
+    )
 
 
 async def validate_user(db: AsyncSession, email: str, password: str) -> User:
@@ -33,7 +54,11 @@ async def validate_user(db: AsyncSession, email: str, password: str) -> User:
     result = await db.execute(stmt)
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(password, user.password):
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await verify_and_update_password_async(password, user.password)
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ERRORS["AUTH"]["INVALID_CREDENTIALS"],
@@ -51,25 +76,35 @@ async def validate_user(db: AsyncSession, email: str, password: str) -> User:
             detail=ERRORS["AUTH"]["ACCOUNT_DISABLED"],
         )
 
+    # Migra gradualmente hashes com esquema ou custo obsoleto
+    if new_hash:
+        user.password = new_hash
+
     return user
 
 
 async def generate_auth_response(db: AsyncSession, user: User) -> LoginResponse:
     jti = str(uuid.uuid4())
 
-    access_token = create_access_token(user.id, user.email, user.role)
-    refresh_token = create_refresh_token(user.id, user.email, user.role, jti)
+    access_token = create_access_token(
+        user.id,
+        user.email,
+        user.role,
+        is_active=user.is_active,
+        token_version=user.token_version,
+    )
+    refresh_token = create_refresh_token(
+        user.id, user.email, user.role, jti, token_version=user.token_version
+    )
 
-    # Salvar refresh token com hash
-    hashed = hash_password(refresh_token)
-    token_entity = RefreshToken(
+    # Salvar refresh token com digest
+    store = get_refresh_token_store(db)
+    await store.save(
         jti=jti,
-        hashed_token=hashed,
-        is_revoked=False,
         user_id=user.id,
+        token_digest=digest_refresh_token(refresh_token),
+        expires_at=datetime.now(UTC) + timedelta(days=settings.JWT_REFRESH_EXPIRATION_DAYS),
     )
-    db.add(token_entity)
-    await db.flush()
 
     return LoginResponse(
         access_token=access_token,
@@ -93,13 +128,7 @@ async def logout(db: AsyncSession, refresh_token: str) -> None:
     if not jti:
         return
 
-    stmt = select(RefreshToken).where(RefreshToken.jti == jti)
-    result = await db.execute(stmt)
-    token = result.scalar_one_or_none()
-
-    if token:
-        token.is_revoked = True
-        await db.flush()
+    await get_refresh_token_store(db).revoke(jti)
 
 
 async def refresh_tokens(db: AsyncSession, refresh_token_str: str) -> LoginResponse:
@@ -114,37 +143,49 @@ async def refresh_tokens(db: AsyncSession, refresh_token_str: str) -> LoginRespo
             detail=ERRORS["AUTH"]["ACCESS_DENIED"],
         )
 
-    # Verificar se o token existe e não foi revogado
-    stmt = select(RefreshToken).where(RefreshToken.jti == jti)
-    result = await db.execute(stmt)
-    token_record = result.scalar_one_or_none()
-
-    if not token_record or token_record.is_revoked:
+    # Revogar o token antigo; falha se ele não existir, já tiver sido usado ou o
+    # digest não conferir
+    token_record = await get_refresh_token_store(db).consume(
+        jti, digest_refresh_token(refresh_token_str)
+    )
+    if not token_record or not await verify_legacy_refresh_token(refresh_token_str, token_record):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=ERRORS["AUTH"]["ACCESS_DENIED"],
         )
 
-    # Verificar hash do token
-    if not verify_password(refresh_token_str, token_record.hashed_token):
+    # Buscar usuário e gerar novos tokens
+    user = await db.get(User, uuid.UUID(user_id))
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ERRORS["AUTH"]["NOT_FOUND"],
+        )
+
+    # Tokens emitidos antes de uma revogação (token_version incrementado) não renovam
+    if payload.get("ver", 0) < user.token_version:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=ERRORS["AUTH"]["ACCESS_DENIED"],
         )
 
-    # Revogar o token antigo
-    token_record.is_revoked = True
-    await db.flush()
+    return await generate_auth_response(db, user)
 
-    # Buscar usuário e gerar novos tokens
-    user = await db.get(User, uuid.UUID(user_id))
+
+async def logout_all(db: AsyncSession, user_id: uuid.UUID) -> MessageResponse:
+    """Encerra todas as sessões do usuário (access e refresh tokens)."""
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ERRORS["AUTH"]["NOT_FOUND"],
         )
 
-    return await generate_auth_response(db, user)
+    revoke_user_tokens(db, user)
+    await get_refresh_token_store(db).revoke_all(user_id)
+    await db.flush()
+
+    return MessageResponse(message=ERRORS["AUTH"]["SESSIONS_REVOKED"])
 
 
 async def change_password(
@@ -158,7 +199,7 @@ async def change_password(
             detail=ERRORS["AUTH"]["NOT_FOUND"],
         )
 
-    if not verify_password(data.old_password, user.password):
+    if not await verify_password_async(data.old_password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ERRORS["AUTH"]["OLD_PASSWORD_INCORRECT"],
@@ -170,11 +211,12 @@ async def change_password(
             detail=ERRORS["AUTH"]["PASSWORD_SAME_AS_OLD"],
         )
 
-    user.password = hash_password(data.new_password)
+    user.password = await hash_password_async(data.new_password)
 
     if user.must_change_password:
         user.must_change_password = False
 
+    revoke_user_tokens(db, user)
     await db.flush()
 
     return MessageResponse(message=ERRORS["AUTH"]["PASSWORD_CHANGED"])
@@ -0,0 +1,243 @@
+import json
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from sqlalchemy import or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.batching import refresh_token_batcher
+from app.auth.models import RefreshToken
+from app.core.config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class RefreshTokenRecord:
+    """Refresh token consumido; `hashed_token` só existe em registros legados (bcrypt)."""
+
+    user_id: uuid.UUID
+    token_digest: str | None
+    hashed_token: str | None = None
+
+
+class RefreshTokenStore(ABC):
+    """Armazenamento dos refresh tokens emitidos (sessões)."""
+
+    @abstractmethod
+    async def save(
+        self, jti: str, user_id: uuid.UUID, token_digest: str, expires_at: datetime
+    ) -> None: ...
+
+    @abstractmethod
+    async def consume(self, jti: str, token_digest: str) -> RefreshTokenRecord | None:
+        """
+        Revoga o token de forma atômica e retorna o registro, ou None se ele não
+        existir, já tiver sido usado/revogado ou o digest não conferir. Um digest
+        divergente não revoga o token.
+        """
+
+    @abstractmethod
+    async def revoke(self, jti: str) -> None: ...
+
+    @abstractmethod
+    async def revoke_all(self, user_id: uuid.UUID) -> None: ...
+
+
+class DatabaseRefreshTokenStore(RefreshTokenStore):
+    """Tabela `refresh_tokens` no Postgres, na transação da requisição."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def save(
+        self, jti: str, user_id: uuid.UUID, token_digest: str, expires_at: datetime
+    ) -> None:
+        values = {
+            "jti": jti,
+            "token_digest": token_digest,
+            "is_revoked": False,
+            "user_id": user_id,
+            "expires_at": expires_at,
+        }
+        if settings.REFRESH_TOKEN_BATCH_ENABLED:
+            # Gravado e commitado em lote, fora da transação da requisição
+            await refresh_token_batcher.add(values)
+        else:
+            self.db.add(RefreshToken(**values))
+            await self.db.flush()
+
+    async def consume(self, jti: str, token_digest: str) -> RefreshTokenRecord | None:
+        # Registros legados não têm digest; o hash bcrypt é conferido pelo chamador
+        stmt = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.jti == jti,
+                RefreshToken.is_revoked.is_(False),
+                or_(
+                    RefreshToken.token_digest == token_digest,
+                    RefreshToken.token_digest.is_(None),
+                ),
+            )
+            .values(is_revoked=True)
+            .returning(RefreshToken.user_id, RefreshToken.token_digest, RefreshToken.hashed_token)
+        )
+        row = (await self.db.execute(stmt)).one_or_none()
+        return RefreshTokenRecord(*row) if row else None
+
+    async def revoke(self, jti: str) -> None:
+        stmt = update(RefreshToken).where(RefreshToken.jti == jti).values(is_revoked=True)
+        await self.db.execute(stmt)
+
+    async def revoke_all(self, user_id: uuid.UUID) -> None:
+        stmt = (
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.is_revoked.is_(False))
+            .values(is_revoked=True)
+        )
+        await self.db.execute(stmt)
+
+
+class MemoryRefreshTokenStore(RefreshTokenStore):
+    """
+    Armazenamento no próprio processo, para testes e implantações de um só nó.
+
+    As sessões se perdem ao reiniciar a aplicação.
+    """
+
+    def __init__(self):
+        self._tokens: dict[str, tuple[uuid.UUID, str, float]] = {}
+        self._by_user: dict[uuid.UUID, set[str]] = {}
+
+    async def save(
+        self, jti: str, user_id: uuid.UUID, token_digest: str, expires_at: datetime
+    ) -> None:
+        self._prune()
+        self._tokens[jti] = (user_id, token_digest, expires_at.timestamp())
+        self._by_user.setdefault(user_id, set()).add(jti)
+
+    async def consume(self, jti: str, token_digest: str) -> RefreshTokenRecord | None:
+        entry = self._tokens.get(jti)
+        if entry is None or entry[1] != token_digest or entry[2] <= time.time():
+            return None
+        await self.revoke(jti)
+        return RefreshTokenRecord(user_id=entry[0], token_digest=entry[1])
+
+    async def revoke(self, jti: str) -> None:
+        entry = self._tokens.pop(jti, None)
+        if entry is not None:
+            self._by_user.get(entry[0], set()).discard(jti)
+
+    async def revoke_all(self, user_id: uuid.UUID) -> None:
+        for jti in self._by_user.pop(user_id, set()):
+            self._tokens.pop(jti, None)
+
+    def _prune(self) -> None:
+        now = time.time()
+        for jti in [jti for jti, entry in self._tokens.items() if entry[2] <= now]:
+            user_id = self._tokens.pop(jti)[0]
+            self._by_user.get(user_id, set()).discard(jti)
+
+
+class RedisRefreshTokenStore(RefreshTokenStore):
+    """
+    Armazenamento em Redis (ou compatível, como Valkey e KeyDB).
+
+    Cada token é uma chave com TTL igual à sua validade, então a expiração é feita
+    pelo próprio servidor. O consumo confere o digest e remove a chave em um script
+    Lua, de forma atômica (requer Redis 7+).
+    """
+
+    # Remove a chave só se o digest conferir; senão retorna nil e o token continua válido
+    _CONSUME_SCRIPT = """
+    local value = redis.call("GET", KEYS[1])
+    if not value or cjson.decode(value)["token_digest"] ~= ARGV[1] then
+        return false
+    end
+    redis.call("DEL", KEYS[1])
+    return value
+    """
+
+    def __init__(self, url: str, prefix: str = "refresh_token"):
+        try:
+            from redis import asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "REFRESH_TOKEN_STORE=redis requer o pacote `redis` (pip install redis)"
+            ) from exc
+
+        self.redis = redis.from_url(url)
+        self.prefix = prefix
+        self._consume = self.redis.register_script(self._CONSUME_SCRIPT)
+
+    def _token_key(self, jti: str) -> str:
+        return f"{self.prefix}:{jti}"
+
+    def _user_key(self, user_id: uuid.UUID) -> str:
+        return f"{self.prefix}:user:{user_id}"
+
+    async def save(
+        self, jti: str, user_id: uuid.UUID, token_digest: str, expires_at: datetime
+    ) -> None:
+        ttl = max(int((expires_at - datetime.now(UTC)).total_seconds()), 1)
+        value = json.dumps({"user_id": str(user_id), "token_digest": token_digest})
+        user_key = self._user_key(user_id)
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._token_key(jti), value, ex=ttl)
+            pipe.sadd(user_key, jti)
+            # O índice por usuário vive tanto quanto o token mais novo
+            pipe.expire(user_key, ttl, gt=True)
+            pipe.expire(user_key, ttl, nx=True)
+            await pipe.execute()
+
+    async def consume(self, jti: str, token_digest: str) -> RefreshTokenRecord | None:
+        value = await self._consume(keys=[self._token_key(jti)], args=[token_digest])
+        if value is None:
+            return None
+
+        data = json.loads(value)
+        user_id = uuid.UUID(data["user_id"])
+        await self.redis.srem(self._user_key(user_id), jti)
+        return RefreshTokenRecord(user_id=user_id, token_digest=data["token_digest"])
+
+    async def revoke(self, jti: str) -> None:
+        await self.redis.delete(self._token_key(jti))
+
+    async def revoke_all(self, user_id: uuid.UUID) -> None:
+        user_key = self._user_key(user_id)
+        jtis = await self.redis.smembers(user_key)
+        keys = [self._token_key(jti.decode()) for jti in jtis]
+        await self.redis.delete(user_key, *keys)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+_shared_store: RefreshTokenStore | None = None
+
+
+def get_refresh_token_store(db: AsyncSession) -> RefreshTokenStore:
+    """Retorna o armazenamento configurado em `REFRESH_TOKEN_STORE`."""
+    global _shared_store
+
+    backend = settings.REFRESH_TOKEN_STORE
+    if backend == "database":
+        return DatabaseRefreshTokenStore(db)
+
+    if _shared_store is None:
+        if backend == "redis":
+            _shared_store = RedisRefreshTokenStore(settings.REDIS_URL)
+        else:
+            _shared_store = MemoryRefreshTokenStore()
+    return _shared_store
+
+
+async def close_refresh_token_store() -> None:
+    """Fecha as conexões do armazenamento compartilhado; usado no desligamento."""
+    global _shared_store
+
+    if isinstance(_shared_store, RedisRefreshTokenStore):
+        await _shared_store.close()
+    _shared_store = None
@@ -0,0 +1,81 @@
+"""
+Calibra o custo do hashing de senhas para o hardware atual.
+
+Uso:
+    python -m app.cli.calibrate_hashing --scheme bcrypt --target-ms 250
+    python -m app.cli.calibrate_hashing --scheme argon2 --target-ms 250 --memory-cost 65536
+
+Mede o tempo de hash para custos crescentes e sugere o maior custo cujo tempo
+mediano fica dentro do alvo. A saída pode ser copiada para o `.env`.
+"""
+
+import argparse
+import statistics
+import time
+
+from app.auth.hashing import SUPPORTED_SCHEMES, build_password_context
+from app.core.config import settings
+
+BCRYPT_ROUNDS_RANGE = range(10, 18)
+ARGON2_TIME_COST_RANGE = range(1, 11)
+
+
+def measure_ms(scheme: str, cost: int, memory_cost: int, parallelism: int, samples: int) -> float:
+    context = build_password_context(
+        scheme=scheme,
+        bcrypt_rounds=cost,
+        argon2_time_cost=cost,
+        argon2_memory_cost=memory_cost,
+        argon2_parallelism=parallelism,
+    )
+    context.hash("aquecimento")
+
+    timings = []
+    for _ in range(samples):
+        started_at = time.perf_counter()
+        context.hash("calibracao-de-senha")
+        timings.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(
+    scheme: str, target_ms: float, memory_cost: int, parallelism: int, samples: int
+) -> int:
+    costs = BCRYPT_ROUNDS_RANGE if scheme == "bcrypt" else ARGON2_TIME_COST_RANGE
+    chosen = costs[0]
+
+    for cost in costs:
+        elapsed = measure_ms(scheme, cost, memory_cost, parallelism, samples)
+        print(f"{scheme} custo={cost}: {elapsed:.1f} ms")
+        if elapsed > target_ms:
+            break
+        chosen = cost
+
+    return chosen
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Calibra o custo do hashing de senhas.")
+    parser.add_argument(
+        "--scheme", choices=SUPPORTED_SCHEMES, default=settings.PASSWORD_HASH_SCHEME
+    )
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--memory-cost", type=int, default=settings.PASSWORD_ARGON2_MEMORY_COST)
+    parser.add_argument("--parallelism", type=int, default=settings.PASSWORD_ARGON2_PARALLELISM)
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+
+    cost = calibrate(args.scheme, args.target_ms, args.memory_cost, args.parallelism, args.samples)
+
+    print("\nConfiguração sugerida:")
+    print(f"PASSWORD_HASH_SCHEME={args.scheme}")
+    if args.scheme == "bcrypt":
+        print(f"PASSWORD_BCRYPT_ROUNDS={cost}")
+    else:
+        print(f"PASSWORD_ARGON2_TIME_COST={cost}")
+        print(f"PASSWORD_ARGON2_MEMORY_COST={args.memory_cost}")
+        print(f"PASSWORD_ARGON2_PARALLELISM={args.parallelism}")
+
+
+if __name__ == "__main__":
+    main()
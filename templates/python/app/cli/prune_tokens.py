@@ -0,0 +1,79 @@
+"""
+Remove refresh tokens vencidos e revogados.
+
+Uso:
+    python -m app.cli.prune_tokens
+    python -m app.cli.prune_tokens --batch-size 5000 --revoked-grace-hours 24
+
+Apaga as linhas em lotes pequenos, cada um em sua transação, para não segurar
+locks nem gerar um pico de WAL. Se a tabela estiver particionada por mês (migration
+0004 com `-x partition_refresh_tokens=true`), as partições de meses já vencidos
+são descartadas com DROP TABLE e as dos próximos meses são criadas (a aplicação
+também as cria ao iniciar). Tokens sem partição do mês caem na partição DEFAULT e
+são movidos para a partição certa quando ela é criada. Agende a execução diária.
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import text
+
+from app.auth.partitions import (
+    PARTITION_MONTHS_AHEAD,
+    create_partitions,
+    drop_expired_partitions,
+    is_partitioned,
+)
+from app.core.database import engine
+
+
+async def delete_in_batches(batch_size: int, revoked_grace_hours: int) -> int:
+    """Apaga tokens vencidos ou revogados há mais de `revoked_grace_hours`."""
+    stmt = text(
+        "DELETE FROM refresh_tokens WHERE id IN ("
+        "SELECT id FROM refresh_tokens "
+        "WHERE expires_at < now() "
+        "OR (is_revoked AND updated_at < now() - make_interval(hours => :grace)) "
+        "LIMIT :batch_size)"
+    )
+    total = 0
+    while True:
+        async with engine.begin() as conn:
+            result = await conn.execute(
+                stmt, {"grace": revoked_grace_hours, "batch_size": batch_size}
+            )
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            return total
+
+
+async def prune(batch_size: int, revoked_grace_hours: int, months_ahead: int) -> None:
+    async with engine.begin() as conn:
+        if await is_partitioned(conn):
+            for name in await drop_expired_partitions(conn):
+                print(f"Partição removida: {name}")
+            for name in await create_partitions(conn, months_ahead):
+                print(f"Partição criada: {name}")
+
+    deleted = await delete_in_batches(batch_size, revoked_grace_hours)
+    print(f"Tokens removidos: {deleted}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Remove refresh tokens vencidos e revogados.")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--revoked-grace-hours", type=int, default=24)
+    parser.add_argument("--months-ahead", type=int, default=PARTITION_MONTHS_AHEAD)
+    args = parser.parse_args()
+
+    async def run() -> None:
+        try:
+            await prune(args.batch_size, args.revoked_grace_hours, args.months_ahead)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
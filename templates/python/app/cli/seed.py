@@ -0,0 +1,253 @@
+"""
+Gera usuários e refresh tokens sintéticos para testes de desempenho.
+
+Uso:
+    python -m app.cli.seed --users 1000000
+    python -m app.cli.seed --users 5000000 --tokens-per-user 3 --deleted-ratio 0.1 --seed 42
+
+As linhas são carregadas com COPY (`copy_records_to_table` do asyncpg), em lotes
+que já chegam commitados. Todos os usuários recebem o mesmo hash de senha,
+calculado uma única vez. Nomes, domínios de e-mail e DDDs seguem distribuições
+desiguais, como em bases reais, para que buscas, índices e estatísticas do
+planner se comportem como em produção. Não rode em produção.
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import time
+import unicodedata
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import text
+
+from app.auth.enums import Role
+from app.auth.hashing import hash_password
+from app.auth.partitions import is_partitioned
+from app.core.config import settings
+from app.core.database import engine
+
+USER_COLUMNS = (
+    "id",
+    "email",
+    "name",
+    "phone",
+    "password",
+    "is_active",
+    "role",
+    "must_change_password",
+    "deleted_at",
+    "token_version",
+    "created_at",
+    "updated_at",
+)
+TOKEN_COLUMNS = (
+    "id",
+    "jti",
+    "token_digest",
+    "is_revoked",
+    "expires_at",
+    "user_id",
+    "created_at",
+    "updated_at",
+)
+
+# Pesos aproximados de frequência; poucos nomes concentram muitos usuários
+# fmt: off
+FIRST_NAMES = {
+    "Maria": 30, "José": 24, "Ana": 22, "João": 20, "Antônio": 12, "Francisco": 10,
+    "Carlos": 10, "Paulo": 9, "Pedro": 9, "Lucas": 9, "Luiz": 8, "Marcos": 7,
+    "Luís": 6, "Gabriel": 6, "Rafael": 6, "Juliana": 6, "Fernanda": 6, "Beatriz": 5,
+    "Camila": 5, "Larissa": 4, "Letícia": 4, "Bruna": 4, "Amanda": 4, "Patrícia": 4,
+    "Mariana": 4, "Gustavo": 4, "Felipe": 4, "Matheus": 4, "Júlia": 3, "Vitória": 3,
+    "Thiago": 3, "Rodrigo": 3, "Eduardo": 3, "Daniel": 3, "Aline": 2, "Sabrina": 2,
+    "Renata": 2, "Vinícius": 2, "Caio": 2, "Heitor": 1, "Yasmin": 1, "Valentina": 1,
+}
+LAST_NAMES = {
+    "Silva": 30, "Santos": 20, "Oliveira": 15, "Souza": 13, "Rodrigues": 10,
+    "Ferreira": 9, "Alves": 9, "Pereira": 8, "Lima": 8, "Gomes": 7, "Costa": 6,
+    "Ribeiro": 6, "Martins": 5, "Carvalho": 5, "Almeida": 4, "Lopes": 4, "Soares": 3,
+    "Fernandes": 3, "Vieira": 3, "Barbosa": 3, "Rocha": 2, "Dias": 2, "Nascimento": 2,
+    "Andrade": 2, "Moreira": 2, "Nunes": 2, "Marques": 1, "Machado": 1, "Mendes": 1,
+    "Freitas": 1, "Cardoso": 1, "Ramos": 1, "Teixeira": 1, "Araújo": 1,
+}
+EMAIL_DOMAINS = {
+    "gmail.com": 45, "hotmail.com": 18, "outlook.com": 10, "yahoo.com.br": 7,
+    "icloud.com": 4, "uol.com.br": 3, "bol.com.br": 2, "innovationhub.com": 1,
+    "usp.br": 1, "empresa.com.br": 2,
+}
+AREA_CODES = {"11": 30, "21": 12, "31": 8, "41": 5, "51": 5, "61": 5, "71": 4, "81": 4, "85": 3}
+# fmt: on
+
+
+def _ascii(value: str) -> str:
+    return unicodedata.normalize("NFD", value).encode("ascii", "ignore").decode().lower()
+
+
+class Generator:
+    """Gera as tuplas das linhas na ordem de `USER_COLUMNS` e `TOKEN_COLUMNS`."""
+
+    def __init__(self, args: argparse.Namespace, password_hash: str, partitioned: bool):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.password_hash = password_hash
+        self.now = datetime.now(UTC)
+        self.refresh_lifetime = timedelta(days=settings.JWT_REFRESH_EXPIRATION_DAYS)
+        # Em tabela particionada só há partições para tokens ainda não vencidos
+        self.token_window = self.refresh_lifetime if partitioned else timedelta(days=args.days)
+        self.first_names = list(FIRST_NAMES)
+        self.first_weights = list(itertools.accumulate(FIRST_NAMES.values()))
+        self.last_names = list(LAST_NAMES)
+        self.last_weights = list(itertools.accumulate(LAST_NAMES.values()))
+        self.domains = list(EMAIL_DOMAINS)
+        self.domain_weights = list(itertools.accumulate(EMAIL_DOMAINS.values()))
+        self.area_codes = list(AREA_CODES)
+        self.area_weights = list(itertools.accumulate(AREA_CODES.values()))
+        self.email_names = {name: _ascii(name) for name in (*FIRST_NAMES, *LAST_NAMES)}
+
+    def new_uuid(self) -> uuid.UUID:
+        # Mais rápido que uuid4() (sem os.urandom) e reproduzível com --seed
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def users(self, start: int, count: int) -> tuple[list[tuple], list[tuple]]:
+        rng, args = self.rng, self.args
+        users, tokens = [], []
+        span = args.days * 86400
+
+        for index in range(start, start + count):
+            first = rng.choices(self.first_names, cum_weights=self.first_weights)[0]
+            last = rng.choices(self.last_names, cum_weights=self.last_weights)[0]
+            second_last = rng.choices(self.last_names, cum_weights=self.last_weights)[0]
+            domain = rng.choices(self.domains, cum_weights=self.domain_weights)[0]
+            email = f"{self.email_names[first]}.{self.email_names[last]}{index}@{domain}"
+
+            phone = None
+            if rng.random() < args.phone_ratio:
+                area = rng.choices(self.area_codes, cum_weights=self.area_weights)[0]
+                phone = f"+55 {area} 9{rng.randrange(10**7, 10**8)}"
+
+            # Cadastros crescem com o tempo: mais usuários recentes que antigos
+            created_at = self.now - timedelta(seconds=span * (1 - rng.random() ** 0.5))
+            updated_at = created_at + (self.now - created_at) * rng.random()
+            deleted_at = updated_at if rng.random() < args.deleted_ratio else None
+            role = Role.ADMIN if rng.random() < args.admin_ratio else Role.USER
+            user_id = self.new_uuid()
+
+            users.append(
+                (
+                    user_id,
+                    email,
+                    f"{first} {last} {second_last}",
+                    phone,
+                    self.password_hash,
+                    rng.random() >= args.inactive_ratio,
+                    role.name,  # Enum(Role) grava o nome do membro
+                    rng.random() < args.must_change_password_ratio,
+                    deleted_at,
+                    0,
+                    created_at,
+                    updated_at,
+                )
+            )
+
+            if deleted_at is None:
+                tokens.extend(self.tokens(user_id, created_at))
+
+        return users, tokens
+
+    def tokens(self, user_id: uuid.UUID, user_created_at: datetime) -> list[tuple]:
+        rng = self.rng
+        average = self.args.tokens_per_user
+        count = round(rng.expovariate(1 / average)) if average else 0
+        oldest = max(user_created_at, self.now - self.token_window)
+        rows = []
+
+        for _ in range(count):
+            created_at = oldest + (self.now - oldest) * rng.random()
+            expires_at = created_at + self.refresh_lifetime
+            # Tokens de sessões já encerradas (refresh ou logout) ficam revogados
+            is_revoked = rng.random() < self.args.revoked_ratio
+            rows.append(
+                (
+                    self.new_uuid(),
+                    str(self.new_uuid()),
+                    f"{rng.getrandbits(256):064x}",
+                    is_revoked,
+                    expires_at,
+                    user_id,
+                    created_at,
+                    created_at,
+                )
+            )
+
+        return rows
+
+
+async def seed(args: argparse.Namespace) -> None:
+    password_hash = hash_password(args.password)
+
+    async with engine.connect() as conn:
+        partitioned = await is_partitioned(conn)
+        # Continua a numeração dos e-mails de execuções anteriores
+        offset = await conn.scalar(text("SELECT count(*) FROM users"))
+        # Encerra a transação aberta pelas consultas: os COPY seguintes commitam sozinhos
+        await conn.commit()
+        raw = await conn.get_raw_connection()
+        copy_conn = raw.driver_connection
+
+        generator = Generator(args, password_hash, partitioned)
+        started_at = time.perf_counter()
+        total_users = total_tokens = 0
+
+        for start in range(offset, offset + args.users, args.batch_size):
+            count = min(args.batch_size, offset + args.users - start)
+            users, tokens = generator.users(start, count)
+            # Cada COPY é atômico e commitado sozinho; usuários antes dos tokens (FK)
+            await copy_conn.copy_records_to_table("users", records=users, columns=USER_COLUMNS)
+            if tokens:
+                await copy_conn.copy_records_to_table(
+                    "refresh_tokens", records=tokens, columns=TOKEN_COLUMNS
+                )
+
+            total_users += len(users)
+            total_tokens += len(tokens)
+            elapsed = time.perf_counter() - started_at
+            print(
+                f"{total_users:>10} usuários, {total_tokens:>10} tokens "
+                f"({(total_users + total_tokens) / elapsed:,.0f} linhas/s)"
+            )
+
+        # Atualiza as estatísticas do planner (e a contagem estimada da paginação)
+        await copy_conn.execute("ANALYZE users")
+        await copy_conn.execute("ANALYZE refresh_tokens")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gera usuários e refresh tokens sintéticos.")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--tokens-per-user", type=float, default=2.0, help="média por usuário")
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--days", type=int, default=730, help="período dos cadastros")
+    parser.add_argument("--deleted-ratio", type=float, default=0.05)
+    parser.add_argument("--inactive-ratio", type=float, default=0.03)
+    parser.add_argument("--admin-ratio", type=float, default=0.001)
+    parser.add_argument("--must-change-password-ratio", type=float, default=0.1)
+    parser.add_argument("--phone-ratio", type=float, default=0.6)
+    parser.add_argument("--revoked-ratio", type=float, default=0.5)
+    parser.add_argument("--password", default=settings.DEFAULT_PASSWORD)
+    parser.add_argument("--seed", type=int, default=None, help="semente para dados reproduzíveis")
+    args = parser.parse_args()
+
+    async def run() -> None:
+        try:
+            await seed(args)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ from app.common.base_model import Base, BaseModel
 from app.common.base_repository import BaseRepository
 from app.common.errors import ERRORS
 from app.common.pagination import PaginatedResult, PaginationMeta
-from app.common.schemas import BaseQueryParams, SortOrder
+from app.common.schemas import BaseQueryParams, CountMode, SearchMode, SortOrder
 from app.common.utils import create_slug
 
 __all__ = [
@@ -13,6 +13,8 @@ __all__ = [
     "PaginatedResult",
     "PaginationMeta",
     "BaseQueryParams",
+    "CountMode",
+    "SearchMode",
     "SortOrder",
     "create_slug",
 ]
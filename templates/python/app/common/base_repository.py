@@ -1,18 +1,51 @@
+import hashlib
+import json
 import uuid
+from collections.abc import AsyncIterator, Sequence
 from typing import Generic, TypeVar
 
-from sqlalchemy import desc, func, select
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    desc,
+    func,
+    literal,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.sql.visitors import InternalTraversal
 
 from app.common.base_model import BaseModel
+from app.common.cache import TTLCache
+from app.common.cursor import decode_cursor, encode_cursor
 from app.common.pagination import PaginatedResult, PaginationMeta
+from app.common.schemas import CountMode, SearchMode
+from app.common.search import fulltext_filter, substring_filter
+from app.core.config import settings
 
 T = TypeVar("T", bound=BaseModel)
 
+_count_cache: TTLCache[int] = TTLCache(
+    max_size=settings.PAGINATION_COUNT_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PAGINATION_COUNT_CACHE_TTL_SECONDS,
+)
+
 
 class BaseRepository(Generic[T]):
     """Repositório base genérico."""
 
+    # Colunas usadas pela busca por substring (ILIKE, servida por índices pg_trgm)
+    search_columns: tuple[str, ...] = ()
+    # Coluna tsvector usada pela busca full-text, se o model tiver uma
+    search_vector_column: str | None = None
+
     def __init__(self, model: type[T], session: AsyncSession):
         self.model = model
         self.session = session
@@ -25,23 +58,132 @@ class BaseRepository(Generic[T]):
     async def find_by_id(self, id: uuid.UUID) -> T | None:
         return await self.session.get(self.model, id)
 
+    async def stream(
+        self, batch_size: int = 1000, stmt: Select | None = None
+    ) -> AsyncIterator[list[T]]:
+        """
+        Percorre o resultado em lotes usando um cursor do lado do servidor.
+
+        Apenas `batch_size` linhas ficam em memória por vez, então serve para
+        exportações e processamentos sobre a tabela inteira.
+        """
+        if stmt is None:
+            stmt = select(self.model).order_by(desc(self.model.created_at))
+
+        result = await self.session.stream_scalars(stmt.execution_options(yield_per=batch_size))
+        async for batch in result.partitions():
+            yield list(batch)
+
     async def create(self, data: dict) -> T:
-        entity = self.model(**data)
-        self.session.add(entity)
-        await self.session.flush()
-        await self.session.refresh(entity)
-        return entity
+        """Insere a linha e a carrega no identity map em um único `INSERT ... RETURNING`."""
+        stmt = pg_insert(self.model).values(**data).returning(self.model)
+        result = await self.session.scalars(stmt)
+        return result.one()
 
-    async def update(self, id: uuid.UUID, data: dict) -> T | None:
-        entity = await self.find_by_id(id)
-        if not entity:
-            return None
-        for key, value in data.items():
-            if value is not None:
-                setattr(entity, key, value)
-        await self.session.flush()
-        await self.session.refresh(entity)
-        return entity
+    async def create_if_not_exists(self, data: dict, conflict_columns: Sequence[str]) -> T | None:
+        """
+        Como `create`, mas retorna None se a linha violar a unicidade de
+        `conflict_columns` (`ON CONFLICT DO NOTHING`), sem consulta prévia.
+        """
+        stmt = (
+            pg_insert(self.model)
+            .values(**data)
+            .on_conflict_do_nothing(index_elements=list(conflict_columns))
+            .returning(self.model)
+        )
+        result = await self.session.scalars(stmt)
+        return result.one_or_none()
+
+    async def update(
+        self, id: uuid.UUID, data: dict, skip_none: bool = True, include_deleted: bool = True
+    ) -> T | None:
+        """
+        Atualiza a linha em um único `UPDATE ... RETURNING`, já refletido no
+        identity map. Valores None são ignorados, a menos que `skip_none=False`.
+        Com `include_deleted=False`, linhas com soft delete não são atualizadas.
+        """
+        values = {key: value for key, value in data.items() if value is not None or not skip_none}
+
+        conditions = [self.model.id == id]
+        if not include_deleted and hasattr(self.model, "deleted_at"):
+            conditions.append(self.model.deleted_at.is_(None))
+
+        if not values:
+            result = await self.session.scalars(select(self.model).where(*conditions))
+            return result.one_or_none()
+
+        stmt = update(self.model).where(*conditions).values(**values).returning(self.model)
+        result = await self.session.scalars(stmt, execution_options={"populate_existing": True})
+        return result.one_or_none()
+
+    async def bulk_create(
+        self, rows: list[dict], conflict_columns: Sequence[str] | None = None
+    ) -> list[T]:
+        """
+        Insere várias linhas em um único `INSERT ... RETURNING`.
+
+        Com `conflict_columns`, linhas que violarem a unicidade dessas colunas são
+        ignoradas (`ON CONFLICT DO NOTHING`) e apenas as inseridas são retornadas.
+        """
+        if not rows:
+            return []
+
+        stmt = pg_insert(self.model)
+        if conflict_columns:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+
+        result = await self.session.scalars(stmt.returning(self.model), rows)
+        return list(result.all())
+
+    async def bulk_upsert(
+        self,
+        rows: list[dict],
+        conflict_columns: Sequence[str],
+        update_columns: Sequence[str] | None = None,
+    ) -> list[T]:
+        """
+        Insere ou atualiza várias linhas (`ON CONFLICT DO UPDATE ... RETURNING`).
+
+        Por padrão atualiza todas as colunas informadas, exceto as de conflito.
+        """
+        if not rows:
+            return []
+
+        if update_columns is None:
+            update_columns = [column for column in rows[0] if column not in conflict_columns]
+
+        stmt = pg_insert(self.model)
+        set_ = {column: stmt.excluded[column] for column in update_columns}
+        # `onupdate` não se aplica ao ON CONFLICT
+        set_["updated_at"] = func.now()
+        stmt = stmt.on_conflict_do_update(index_elements=list(conflict_columns), set_=set_)
+
+        result = await self.session.scalars(
+            stmt.returning(self.model),
+            rows,
+            execution_options={"populate_existing": True},
+        )
+        return list(result.all())
+
+    async def bulk_update(self, ids: Sequence[uuid.UUID], values: dict) -> int:
+        """Aplica `values` a todas as linhas de `ids` em um único UPDATE."""
+        if not ids:
+            return 0
+        stmt = update(self.model).where(self.model.id.in_(ids)).values(**values)
+        result = await self.session.execute(stmt)
+        return result.rowcount
+
+    async def bulk_soft_delete(self, ids: Sequence[uuid.UUID]) -> int:
+        """Soft delete em lote (models com `deleted_at`); retorna as linhas afetadas."""
+        if not ids:
+            return 0
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(ids), self.model.deleted_at.is_(None))
+            .values(deleted_at=func.now())
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
 
     async def delete(self, id: uuid.UUID) -> None:
         entity = await self.find_by_id(id)
@@ -55,21 +197,130 @@ class BaseRepository(Generic[T]):
         limit: int = 10,
         order_by: str = "created_at",
         order_dir: str = "DESC",
+        cursor: str | None = None,
+        count_mode: CountMode = CountMode.EXACT,
     ) -> PaginatedResult[T]:
-        # Contagem total
-        count_stmt = select(func.count()).select_from(self.model)
-        total_result = await self.session.execute(count_stmt)
-        total_items = total_result.scalar() or 0
+        if not hasattr(self.model, order_by):
+            order_by = "created_at"
+
+        return await self._paginate(
+            select(self.model),
+            select(func.count()).select_from(self.model),
+            page=page,
+            limit=limit,
+            sort_by=order_by,
+            sort_order=order_dir,
+            cursor=cursor,
+            count_mode=count_mode,
+        )
 
-        # Query paginada
-        column = getattr(self.model, order_by, self.model.created_at)
-        order = desc(column) if order_dir.upper() == "DESC" else column.asc()
+    def _apply_search(
+        self,
+        stmt: Select,
+        count_stmt: Select,
+        term: str | None,
+        mode: SearchMode = SearchMode.SUBSTRING,
+    ) -> tuple[Select, Select, ColumnElement[float] | None]:
+        """
+        Aplica a busca em `stmt` e `count_stmt`.
+
+        Retorna também a expressão de relevância (`ts_rank`) no modo full-text, para
+        ordenação por `relevance`; nos demais casos ela é `None`.
+        """
+        if not term:
+            return stmt, count_stmt, None
+
+        if mode == SearchMode.FULLTEXT and self.search_vector_column:
+            vector_column = getattr(self.model, self.search_vector_column)
+            search_filter, rank = fulltext_filter(vector_column, term)
+            return stmt.where(search_filter), count_stmt.where(search_filter), rank
+
+        if not self.search_columns:
+            return stmt, count_stmt, None
+
+        columns = [getattr(self.model, name) for name in self.search_columns]
+        search_filter = substring_filter(columns, term)
+        return stmt.where(search_filter), count_stmt.where(search_filter), None
+
+    async def _paginate(
+        self,
+        stmt: Select,
+        count_stmt: Select,
+        *,
+        page: int,
+        limit: int,
+        sort_by: str,
+        sort_order: str,
+        cursor: str | None = None,
+        count_mode: CountMode = CountMode.EXACT,
+        sort_expression: ColumnElement | None = None,
+    ) -> PaginatedResult[T]:
+        """
+        Pagina `stmt` por offset ou, quando há `cursor`, por keyset.
+
+        A ordenação sempre usa `id` como desempate, então o cursor aponta para uma
+        linha exata e a página seguinte é buscada com `(coluna, id) > (valor, id)`,
+        servida pelos índices compostos sem descartar as linhas anteriores. A coluna
+        de ordenação deve ser NOT NULL.
+
+        `count_stmt` deve aplicar os mesmos filtros de `stmt`; como ele é usado
+        depende de `count_mode` (ver `CountMode`). `sort_expression` permite ordenar
+        por uma expressão calculada (ex.: relevância), identificada por `sort_by`.
+        """
+        filtered_stmt = stmt
+        column = sort_expression if sort_expression is not None else getattr(self.model, sort_by)
+        descending = sort_order.upper() == "DESC"
+        key_columns = [column] if sort_by == "id" else [column, self.model.id]
+
+        if cursor:
+            value, last_id = decode_cursor(cursor, sort_by, sort_order)
+            key_values = [value] if sort_by == "id" else [value, last_id]
+            key = tuple_(*key_columns)
+            bound = tuple_(
+                *(literal(v, type_=c.type) for v, c in zip(key_values, key_columns, strict=True))
+            )
+            stmt = stmt.where(key < bound if descending else key > bound)
+        else:
+            stmt = stmt.offset((page - 1) * limit)
+
+        order = [c.desc() if descending else c.asc() for c in key_columns]
+        # Busca um item a mais para saber se existe próxima página
+        stmt = stmt.order_by(*order).limit(limit + 1)
+
+        if sort_expression is not None:
+            stmt = stmt.add_columns(sort_expression)
+
+        # Sem cursor, a contagem exata vem na própria query via count(*) OVER ()
+        window_count = count_mode == CountMode.EXACT and not cursor
+        if window_count:
+            stmt = stmt.add_columns(func.count().over())
 
-        stmt = select(self.model).order_by(order).offset((page - 1) * limit).limit(limit)
         result = await self.session.execute(stmt)
-        data = list(result.scalars().all())
+        rows = result.all()
+        data = [row[0] for row in rows]
+
+        # Contagem total
+        total_items: int | None = None
+        if window_count and rows:
+            total_items = rows[0][-1]
+        elif count_mode == CountMode.ESTIMATED:
+            total_items = await self._estimate_count(filtered_stmt, count_stmt)
+        elif count_mode == CountMode.CACHED:
+            total_items = await self._cached_count(count_stmt)
+        elif count_mode == CountMode.EXACT:
+            total_items = await self._exact_count(count_stmt)
+
+        has_next = len(data) > limit
+        next_cursor = None
+        if has_next:
+            data = data[:limit]
+            last = data[-1]
+            value = rows[limit - 1][1] if sort_expression is not None else getattr(last, sort_by)
+            next_cursor = encode_cursor(sort_by, sort_order, value, last.id)
 
-        total_pages = (total_items + limit - 1) // limit if limit > 0 else 0
+        total_pages = None
+        if total_items is not None:
+            total_pages = (total_items + limit - 1) // limit if limit > 0 else 0
 
         return PaginatedResult(
             data=data,
@@ -79,5 +330,74 @@ class BaseRepository(Generic[T]):
                 items_per_page=limit,
                 total_pages=total_pages,
                 current_page=page,
+                has_next=has_next,
+                count_mode=count_mode,
             ),
+            next_cursor=next_cursor,
         )
+
+    async def _exact_count(self, count_stmt: Select) -> int:
+        result = await self.session.execute(count_stmt)
+        return result.scalar() or 0
+
+    async def _cached_count(self, count_stmt: Select) -> int:
+        """Contagem exata reaproveitada por assinatura de filtro durante o TTL."""
+        signature = _statement_signature(count_stmt)
+        total = _count_cache.get(signature)
+        if total is None:
+            total = await self._exact_count(count_stmt)
+            _count_cache.set(signature, total)
+        return total
+
+    async def _estimate_count(self, filtered_stmt: Select, count_stmt: Select) -> int:
+        """
+        Estimativa do planner do Postgres, sem varrer a tabela.
+
+        Sem filtros usa `pg_class.reltuples`; com filtros usa as linhas previstas
+        pelo `EXPLAIN`. Tabelas nunca analisadas caem na contagem exata.
+        """
+        if filtered_stmt.whereclause is None:
+            stmt = (
+                select(text("reltuples::bigint"))
+                .select_from(text("pg_class"))
+                .where(text("oid = CAST(:table AS regclass)"))
+            )
+            result = await self.session.execute(stmt, {"table": self.model.__tablename__})
+            estimate = result.scalar()
+        else:
+            # `clause` permite que sessões com réplicas roteiem o EXPLAIN como leitura
+            result = await self.session.execute(
+                _Explain(filtered_stmt), bind_arguments={"clause": filtered_stmt}
+            )
+            plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = plan[0]["Plan"]["Plan Rows"]
+
+        if estimate is None or estimate < 0:
+            return await self._exact_count(count_stmt)
+        return int(estimate)
+
+
+class _Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` de um SELECT, com os parâmetros ainda como binds."""
+
+    inherit_cache = True
+    # Leitura: não marca a sessão como tendo escritas nem a prende ao primário
+    is_select = True
+    _traverse_internals = [("statement", InternalTraversal.dp_clauseelement)]
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain)
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+def _statement_signature(stmt: Select) -> str:
+    """Digest do SQL compilado e dos parâmetros; não guarda termos de busca na chave."""
+    compiled = stmt.compile(dialect=asyncpg.dialect())
+    content = repr((str(compiled), sorted(compiled.params.items())))
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
@@ -0,0 +1,78 @@
+import base64
+import hashlib
+import hmac
+import json
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from fastapi import HTTPException, status
+
+from app.common.errors import ERRORS
+from app.core.config import settings
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: str) -> str:
+    digest = hmac.new(
+        settings.PAGINATION_CURSOR_SECRET.encode(), payload.encode(), hashlib.sha256
+    ).digest()
+    return _b64encode(digest[:16])
+
+
+def _encode_value(value: Any) -> list:
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, uuid.UUID):
+        return ["uuid", str(value)]
+    if isinstance(value, Enum):
+        # Colunas Enum do SQLAlchemy persistem o nome do membro
+        return ["raw", value.name]
+    return ["raw", value]
+
+
+def _decode_value(encoded: list) -> Any:
+    kind, value = encoded
+    if kind == "dt":
+        return datetime.fromisoformat(value)
+    if kind == "uuid":
+        return uuid.UUID(value)
+    return value
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, id: uuid.UUID) -> str:
+    """Gera um cursor opaco e assinado apontando para a linha (value, id)."""
+    data = [sort_by, sort_order.upper(), _encode_value(value), str(id)]
+    payload = _b64encode(json.dumps(data, separators=(",", ":")).encode())
+    return f"{payload}.{_sign(payload)}"
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str) -> tuple[Any, uuid.UUID]:
+    """
+    Valida o cursor e retorna o par (valor da coluna de ordenação, id).
+
+    Cursores adulterados ou gerados para outra ordenação resultam em 400.
+    """
+    try:
+        payload, signature = cursor.split(".", 1)
+        if not hmac.compare_digest(signature, _sign(payload)):
+            raise ValueError("assinatura inválida")
+
+        cursor_sort_by, cursor_order, value, id = json.loads(_b64decode(payload))
+        if cursor_sort_by != sort_by or cursor_order != sort_order.upper():
+            raise ValueError("ordenação diferente da do cursor")
+
+        return _decode_value(value), uuid.UUID(id)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERRORS["COMMON"]["INVALID_CURSOR"],
+        ) from exc
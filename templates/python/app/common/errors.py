@@ -13,16 +13,20 @@ ERRORS = {
         ),
         "OLD_PASSWORD_INCORRECT": "A senha antiga está incorreta. Tente novamente.",
         "PASSWORD_SAME_AS_OLD": (
-            "A nova senha deve ser diferente da senha antiga. "
-            "Por favor, escolha uma nova senha."
+            "A nova senha deve ser diferente da senha antiga. Por favor, escolha uma nova senha."
         ),
         "PASSWORD_MIN_LENGTH": "A nova senha deve ter no mínimo 8 caracteres.",
         "PASSWORD_CHANGED": "Senha alterada com sucesso.",
+        "TOKEN_REVOKED": "Sua sessão foi encerrada. Por favor, faça login novamente.",
+        "SESSIONS_REVOKED": "Todas as sessões foram encerradas.",
+        "HASHER_BUSY": "Servidor sobrecarregado. Por favor, tente novamente em instantes.",
+        "TOO_MANY_REQUESTS": "Muitas tentativas. Por favor, aguarde e tente novamente.",
     },
     "USER": {
         "NOT_FOUND": "Usuário não encontrado.",
         "EMAIL_IN_USE": "O e-mail já está em uso.",
         "DEFAULT_PASSWORD_NOT_SET": "Variável de ambiente DEFAULT_PASSWORD não configurada.",
+        "INVALID_IMPORT_FILE": "Arquivo de importação inválido.",
     },
     "IMAGE": {
         "REQUIRED": "O arquivo de imagem é obrigatório.",
@@ -31,5 +35,6 @@ ERRORS = {
         "NOT_FOUND": "Recurso não encontrado.",
         "BAD_REQUEST": "Requisição inválida.",
         "INVALID_ARRAY_FORMAT": "Formato de array inválido.",
+        "INVALID_CURSOR": "Cursor de paginação inválido.",
     },
 }
@@ -0,0 +1,97 @@
+"""
+Validadores HTTP (ETag e Last-Modified) derivados de `updated_at`, para GETs condicionais.
+
+O cliente reenvia o ETag em `If-None-Match` (ou a data em `If-Modified-Since`) e,
+se nada mudou, recebe 304 sem corpo: a serialização e a transferência são evitadas.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+# Respostas com dados do usuário: só o navegador guarda, e sempre revalida
+CACHE_CONTROL = "private, no-cache"
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Drivers sem suporte a fuso (ex.: SQLite) devolvem datas ingênuas, gravadas em UTC
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+def _etag(*parts: Any) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    # Fraco: o mesmo conteúdo pode ter bytes diferentes (ex.: compressão)
+    return f'W/"{digest}"'
+
+
+def version_etag(entity_id: Any, updated_at: datetime, schema: type[BaseModel]) -> str:
+    """ETag de uma entidade; muda com `updated_at` e com os campos do schema."""
+    return _etag(schema.__name__, tuple(schema.model_fields), entity_id, updated_at)
+
+
+def entity_etag(entity: Any, schema: type[BaseModel]) -> str:
+    return version_etag(entity.id, entity.updated_at, schema)
+
+
+def collection_etag(entities: Iterable[Any], schema: type[BaseModel], signature: Any) -> str:
+    """
+    ETag de uma listagem: filtros e metadados (`signature`) mais id e `updated_at`
+    de cada item, para refletir também itens que entraram ou saíram da página.
+    """
+    versions = tuple((entity.id, entity.updated_at) for entity in entities)
+    return _etag(schema.__name__, tuple(schema.model_fields), signature, versions)
+
+
+def last_modified_of(entities: Iterable[Any]) -> datetime | None:
+    return max((entity.updated_at for entity in entities), default=None)
+
+
+def has_conditions(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None = None) -> bool:
+    """
+    Avalia `If-None-Match` e, na ausência dele, `If-Modified-Since` (RFC 9110).
+
+    Passe `last_modified=None` quando a data não basta para detectar mudanças,
+    como em listagens, em que remover um item não altera o maior `updated_at`.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or etag.removeprefix("W/") in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # A data HTTP tem precisão de segundos
+    return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+
+
+def _validator_headers(etag: str, last_modified: datetime | None) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def not_modified(etag: str, last_modified: datetime | None = None) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=_validator_headers(etag, last_modified),
+    )
+
+
+def with_validators(response: Response, etag: str, last_modified: datetime | None) -> Response:
+    response.headers.update(_validator_headers(etag, last_modified))
+    return response
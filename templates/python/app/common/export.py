@@ -0,0 +1,120 @@
+import codecs
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Iterable, Iterator
+from enum import StrEnum
+from typing import BinaryIO
+
+from pydantic import BaseModel
+
+
+class ExportFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+INVALID_ENCODING = "Codificação inválida (esperado UTF-8)"
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+async def serialize_export(
+    batches: AsyncIterator[Iterable],
+    schema: type[BaseModel],
+    export_format: ExportFormat,
+) -> AsyncIterator[bytes]:
+    """
+    Serializa lotes de entidades em NDJSON ou CSV, um chunk por lote.
+
+    Usado com `StreamingResponse`: a memória fica limitada ao tamanho do lote,
+    independente do total de linhas.
+    """
+    fields = list(schema.model_fields)
+
+    if export_format == ExportFormat.CSV:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+        writer.writeheader()
+        yield buffer.getvalue().encode()
+
+        async for batch in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(schema.model_validate(item).model_dump(mode="json") for item in batch)
+            yield buffer.getvalue().encode()
+        return
+
+    async for batch in batches:
+        yield b"".join(
+            schema.model_validate(item).model_dump_json().encode() + b"\n" for item in batch
+        )
+
+
+class ImportFileError(ValueError):
+    """Arquivo que não pode mais ser lido a partir de uma linha (ex.: CSV malformado)."""
+
+    def __init__(self, line: int, detail: str):
+        super().__init__(f"linha {line}: {detail}")
+        self.line = line
+
+
+def _decode_lines(file: BinaryIO) -> Iterator[tuple[int, str | None]]:
+    """Linhas do arquivo em UTF-8 (sem BOM); None nas que não forem UTF-8 válido."""
+    for line_number, raw in enumerate(file, start=1):
+        if line_number == 1:
+            raw = raw.removeprefix(codecs.BOM_UTF8)
+        try:
+            yield line_number, raw.decode()
+        except UnicodeDecodeError:
+            yield line_number, None
+
+
+def _csv_lines(lines: Iterator[tuple[int, str | None]]) -> Iterator[str]:
+    for line_number, line in lines:
+        if line is None:
+            # Um registro do CSV pode ocupar várias linhas: não há como pular só esta
+            raise ImportFileError(line_number, INVALID_ENCODING)
+        yield line
+
+
+def iter_import_rows(
+    file: BinaryIO, import_format: ExportFormat
+) -> Iterator[tuple[int, dict | None, str | None]]:
+    """
+    Lê um arquivo NDJSON ou CSV linha a linha: (número da linha, dados, erro).
+
+    Campos vazios do CSV são omitidos para que os defaults do schema se apliquem.
+    Linhas que não puderem ser lidas vêm com `dados=None` e a descrição do erro;
+    no CSV, codificação inválida ou registro malformado levantam `ImportFileError`.
+    """
+    lines = _decode_lines(file)
+
+    if import_format == ExportFormat.CSV:
+        reader = csv.DictReader(_csv_lines(lines))
+        try:
+            for row in reader:
+                data = {key: value for key, value in row.items() if key and value}
+                yield reader.line_num, data, None
+        except csv.Error as exc:
+            raise ImportFileError(reader.line_num, str(exc)) from exc
+        return
+
+    for line_number, line in lines:
+        if line is None:
+            yield line_number, None, INVALID_ENCODING
+            continue
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            yield line_number, None, "JSON inválido"
+            continue
+        if not isinstance(data, dict):
+            yield line_number, None, "Esperado um objeto JSON"
+            continue
+        yield line_number, data, None
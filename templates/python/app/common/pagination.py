@@ -1,6 +1,8 @@
 from typing import Generic, TypeVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+from app.common.schemas import CountMode
 
 T = TypeVar("T")
 
@@ -8,15 +10,21 @@ T = TypeVar("T")
 class PaginationMeta(BaseModel):
     """Metadados de paginação."""
 
-    total_items: int
+    total_items: int | None
     item_count: int
     items_per_page: int
-    total_pages: int
+    total_pages: int | None
     current_page: int
+    has_next: bool = False
+    count_mode: CountMode = CountMode.EXACT
 
 
 class PaginatedResult(BaseModel, Generic[T]):
     """Resultado paginado genérico."""
 
+    # `data` pode conter entidades do SQLAlchemy, que não são modelos Pydantic
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     data: list[T]
     meta: PaginationMeta
+    next_cursor: str | None = None
@@ -8,13 +8,49 @@ class SortOrder(StrEnum):
     DESC = "DESC"
 
 
+class CountMode(StrEnum):
+    """
+    Estratégia de contagem do total de itens em listagens paginadas.
+
+    - exact: `count(*) OVER ()` na mesma query da página
+    - estimated: estimativa do planner (pg_class/EXPLAIN), sem varrer a tabela
+    - cached: contagem exata reaproveitada por filtro durante um TTL
+    - none: sem total; apenas `has_next`
+    """
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+    NONE = "none"
+
+
+class SearchMode(StrEnum):
+    """
+    Modo de busca textual.
+
+    - substring: `ILIKE '%termo%'` nas colunas de busca (índices pg_trgm)
+    - fulltext: tsvector/tsquery com ordenação opcional por relevância
+    """
+
+    SUBSTRING = "substring"
+    FULLTEXT = "fulltext"
+
+
 class BaseQueryParams(BaseModel):
     """Parâmetros base de query com paginação e ordenação."""
 
     page: int = Field(default=1, ge=1, description="Número da página que deseja buscar.")
-    limit: int = Field(
-        default=10, ge=1, le=100, description="Quantidade de itens por página."
-    )
+    limit: int = Field(default=10, ge=1, le=100, description="Quantidade de itens por página.")
     search: str | None = Field(default=None, description="Termo de busca.")
+    search_mode: SearchMode = Field(
+        default=SearchMode.SUBSTRING, description="Modo de busca textual."
+    )
     sort_by: str = Field(default="created_at", description="Coluna de ordenação.")
     sort_order: SortOrder = Field(default=SortOrder.DESC, description="Direção da ordenação.")
+    cursor: str | None = Field(
+        default=None,
+        description="Cursor retornado em `next_cursor`; quando informado, `page` é ignorado.",
+    )
+    count_mode: CountMode = Field(
+        default=CountMode.EXACT, description="Estratégia de contagem do total de itens."
+    )
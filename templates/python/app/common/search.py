@@ -0,0 +1,32 @@
+from sqlalchemy import REAL, ColumnElement, func, literal_column, or_
+from sqlalchemy.orm import InstrumentedAttribute
+
+# Configuração do full-text search; deve ser a mesma usada na coluna tsvector
+TS_CONFIG = "simple"
+
+
+def escape_like(term: str) -> str:
+    """Escapa os curingas do LIKE para que o termo seja buscado literalmente."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def substring_filter(columns: list[InstrumentedAttribute], term: str) -> ColumnElement[bool]:
+    """
+    Filtro `coluna ILIKE '%termo%'` em qualquer das colunas.
+
+    Servido por índices GIN `gin_trgm_ops` (pg_trgm) a partir de 3 caracteres.
+    """
+    pattern = f"%{escape_like(term)}%"
+    return or_(*(column.ilike(pattern, escape="\\") for column in columns))
+
+
+def fulltext_filter(
+    vector_column: InstrumentedAttribute, term: str
+) -> tuple[ColumnElement[bool], ColumnElement[float]]:
+    """
+    Filtro full-text sobre uma coluna tsvector e a expressão de relevância.
+
+    O termo aceita a sintaxe de busca web (`"frase exata"`, `-excluir`, `a or b`).
+    """
+    query = func.websearch_to_tsquery(literal_column(f"'{TS_CONFIG}'::regconfig"), term)
+    return vector_column.op("@@")(query), func.ts_rank(vector_column, query, type_=REAL)
@@ -0,0 +1,58 @@
+from collections.abc import Iterable
+from functools import cache
+from typing import Any
+
+import orjson
+from fastapi import Response, status
+from pydantic import BaseModel
+
+from app.common.pagination import PaginatedResult
+
+
+@cache
+def _field_names(schema: type[BaseModel]) -> tuple[str, ...]:
+    return tuple(schema.model_fields)
+
+
+def dump_entity(entity: Any, schema: type[BaseModel]) -> dict[str, Any]:
+    """
+    Lê do objeto (ex.: entidade do ORM) apenas os campos do schema, sem validação.
+
+    Serve para schemas planos de resposta cujos campos são atributos da entidade;
+    os dados vêm do banco e já respeitam os tipos, então revalidar é desperdício.
+    """
+    return {name: getattr(entity, name) for name in _field_names(schema)}
+
+
+def dump_entities(entities: Iterable[Any], schema: type[BaseModel]) -> list[dict[str, Any]]:
+    names = _field_names(schema)
+    return [{name: getattr(entity, name) for name in names} for entity in entities]
+
+
+def json_response(content: Any, status_code: int = status.HTTP_200_OK) -> Response:
+    """Resposta JSON serializada com orjson (UUID, datetime e Enum nativos)."""
+    return Response(
+        content=orjson.dumps(content),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+def entity_response(
+    entity: Any, schema: type[BaseModel], status_code: int = status.HTTP_200_OK
+) -> Response:
+    return json_response(dump_entity(entity, schema), status_code)
+
+
+def entities_response(entities: Iterable[Any], schema: type[BaseModel]) -> Response:
+    return json_response(dump_entities(entities, schema))
+
+
+def paginated_response(result: PaginatedResult, schema: type[BaseModel]) -> Response:
+    return json_response(
+        {
+            "data": dump_entities(result.data, schema),
+            "meta": result.meta.model_dump(),
+            "next_cursor": result.next_cursor,
+        }
+    )
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,11 +14,87 @@ class Settings(BaseSettings):
     DATABASE_NAME: str = "innovationhub"
     DATABASE_SSL: bool = False
 
+    # Pool de conexões (por worker): workers * (POOL_SIZE + MAX_OVERFLOW) deve
+    # ficar abaixo do max_connections do Postgres
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100
+    # Tempo máximo de cada query no servidor (0 desativa)
+    DATABASE_STATEMENT_TIMEOUT_MS: int = 0
+    # Conexões abertas e aquecidas na inicialização, por engine (0 desativa)
+    DATABASE_POOL_WARMUP_CONNECTIONS: int = 2
+    # Compatibilidade com PgBouncer em modo de pool por transação
+    DATABASE_PGBOUNCER: bool = False
+
+    # Réplicas de leitura ("host" ou "host:porta", separados por vírgula)
+    DATABASE_REPLICA_HOSTS: str = ""
+    DATABASE_REPLICA_COOLDOWN_SECONDS: int = 30
+
     # JWT
     JWT_SECRET: str = "change-me"
     JWT_EXPIRATION_MINUTES: int = 15
     JWT_REFRESH_SECRET: str = "change-me-refresh"
     JWT_REFRESH_EXPIRATION_DAYS: int = 7
+    JWT_REFRESH_DIGEST_SECRET: str = "change-me-refresh-digest"
+
+    # Armazenamento dos refresh tokens: "database", "redis" ou "memory" (um só nó)
+    REFRESH_TOKEN_STORE: Literal["database", "memory", "redis"] = "database"
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Agrupamento dos inserts de refresh tokens em lotes (group commit)
+    REFRESH_TOKEN_BATCH_ENABLED: bool = False
+    REFRESH_TOKEN_BATCH_WINDOW_MS: float = 5
+    REFRESH_TOKEN_BATCH_MAX_SIZE: int = 500
+
+    # Modo stateless: confia nas claims do access token e não consulta o banco
+    AUTH_STATELESS: bool = False
+    TOKEN_DENYLIST_SYNC_SECONDS: int = 5
+
+    # Hashing de senhas ("bcrypt" ou "argon2"; custos via app.cli.calibrate_hashing)
+    PASSWORD_HASH_SCHEME: str = "bcrypt"
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_ARGON2_TIME_COST: int = 3
+    PASSWORD_ARGON2_MEMORY_COST: int = 65536
+    PASSWORD_ARGON2_PARALLELISM: int = 4
+
+    # Pool de hashing de senhas (fora do event loop)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    # Cria os threads e carrega o backend de hashing na inicialização
+    PASSWORD_HASH_WARMUP: bool = True
+
+    # Limite de requisições nas rotas de autenticação ("quantidade/second|minute|hour";
+    # vazio desativa o limite). Backend "memory" (por worker) ou "sqlite" (por host)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_SQLITE_PATH: str = "/tmp/innovationhub-rate-limit.sqlite3"
+    RATE_LIMIT_LOGIN_PER_IP: str = "20/minute"
+    RATE_LIMIT_LOGIN_PER_EMAIL: str = "5/minute"
+    RATE_LIMIT_REFRESH_PER_IP: str = "60/minute"
+    RATE_LIMIT_CHANGE_PASSWORD_PER_IP: str = "10/minute"
+    RATE_LIMIT_CHANGE_PASSWORD_PER_USER: str = "5/minute"
+    # Soma das três rotas; calibre pelo throughput de hashing do host
+    RATE_LIMIT_GLOBAL: str = "50/second"
+
+    # Cache de usuários autenticados (0 desativa)
+    USER_CACHE_MAX_SIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: int = 30
+
+    # Paginação
+    PAGINATION_CURSOR_SECRET: str = "change-me-cursor"
+    PAGINATION_COUNT_CACHE_MAX_SIZE: int = 1_000
+    PAGINATION_COUNT_CACHE_TTL_SECONDS: int = 60
+
+    # Métricas do Prometheus em /metrics (requer prometheus-client)
+    METRICS_ENABLED: bool = False
+
+    # Profiler de SQL por requisição (desenvolvimento/homologação)
+    SQL_PROFILER_ENABLED: bool = False
+    SQL_PROFILER_SLOW_QUERY_MS: float = 100
+    SQL_PROFILER_REPEATED_THRESHOLD: int = 5
 
     # Default password
     DEFAULT_PASSWORD: str = "ih123"
@@ -39,6 +117,21 @@ class Settings(BaseSettings):
             f"@{self.DATABASE_HOST}:{self.DATABASE_PORT}/{self.DATABASE_NAME}"
         )
 
+    @property
+    def database_replica_urls(self) -> list[str]:
+        urls = []
+        for host in self.DATABASE_REPLICA_HOSTS.split(","):
+            host = host.strip()
+            if not host:
+                continue
+            if ":" not in host:
+                host = f"{host}:{self.DATABASE_PORT}"
+            urls.append(
+                f"postgresql+asyncpg://{self.DATABASE_USERNAME}:{self.DATABASE_PASSWORD}"
+                f"@{host}/{self.DATABASE_NAME}"
+            )
+        return urls
+
     @property
     def database_url_sync(self) -> str:
         """URL síncrona para uso com Alembic."""
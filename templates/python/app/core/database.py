@@ -1,20 +1,322 @@
-from collections.abc import AsyncGenerator
+import asyncio
+import functools
+import itertools
+import logging
+import time
+import uuid
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import Select, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.pool import InstrumentedAsyncPool
+
+logger = logging.getLogger(__name__)
+
+_USE_PRIMARY_KEY = "use_primary"
+_REPLICA_KEY = "replica"
+_HAS_WRITES_KEY = "has_writes"
+
+
+def _connect_args() -> dict:
+    if settings.DATABASE_PGBOUNCER:
+        # Com pool por transação, cada transação pode cair em outra conexão do
+        # servidor: sem cache de prepared statements e com nomes únicos. Parâmetros
+        # de inicialização (server_settings) também não são repassados pelo PgBouncer.
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+
+    connect_args: dict = {"prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE}
+    if settings.DATABASE_STATEMENT_TIMEOUT_MS:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.DATABASE_STATEMENT_TIMEOUT_MS)
+        }
+    return connect_args
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    new_engine = create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        connect_args=_connect_args(),
+    )
+
+    if settings.DATABASE_PGBOUNCER and settings.DATABASE_STATEMENT_TIMEOUT_MS:
+
+        @event.listens_for(new_engine.sync_engine, "begin")
+        def _set_statement_timeout(conn) -> None:
+            # SET LOCAL vale só para a transação, então é seguro com pool por transação
+            conn.exec_driver_sql(
+                f"SET LOCAL statement_timeout = {int(settings.DATABASE_STATEMENT_TIMEOUT_MS)}"
+            )
+
+    return new_engine
+
+
+class ReplicaSet:
+    """
+    Réplicas de leitura escolhidas em round-robin.
+
+    Uma réplica com erro de conexão fica fora da rotação por `cooldown_seconds`;
+    sem réplicas saudáveis, as leituras vão para o primário. A sessão que encontra
+    a réplica fora do ar na primeira leitura também segue no primário.
+    """
+
+    def __init__(self, engines: list[AsyncEngine], cooldown_seconds: float):
+        self.engines = engines
+        self.cooldown_seconds = cooldown_seconds
+        self._counter = itertools.count()
+        self._unhealthy_until: dict[Engine, float] = {}
+
+        for replica in engines:
+            event.listen(
+                replica.sync_engine, "handle_error", functools.partial(self._on_error, replica)
+            )
+
+    def choose(self) -> AsyncEngine | None:
+        for _ in range(len(self.engines)):
+            replica = self.engines[next(self._counter) % len(self.engines)]
+            if self.is_healthy(replica):
+                return replica
+        return None
+
+    def is_healthy(self, replica: AsyncEngine) -> bool:
+        now = time.monotonic()
+        if self._unhealthy_until.get(replica.sync_engine, 0.0) > now:
+            return False
+        # Erros ao abrir conexão não passam pelo `handle_error`; vêm do pool
+        failed_at = replica.pool.last_connect_error_at
+        return failed_at is None or failed_at + self.cooldown_seconds <= now
+
+    def mark_unhealthy(self, sync_engine: Engine) -> None:
+        self._unhealthy_until[sync_engine] = time.monotonic() + self.cooldown_seconds
+
+    def _on_error(self, replica: AsyncEngine, context) -> None:
+        # Conexão perdida no meio de uma query
+        if context.is_disconnect or isinstance(context.original_exception, OSError):
+            self.mark_unhealthy(replica.sync_engine)
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            f"{replica.url.host}:{replica.url.port}": {
+                **replica.pool.stats(),
+                "healthy": self.is_healthy(replica),
+            }
+            for replica in self.engines
+        }
+
+
+engine = _create_engine(settings.database_url)
+
+replicas = ReplicaSet(
+    [_create_engine(url) for url in settings.database_replica_urls],
+    cooldown_seconds=settings.DATABASE_REPLICA_COOLDOWN_SECONDS,
+)
+
+
+_read_only_engines: dict[Engine, Engine] = {}
+
+
+def _read_only(sync_engine: Engine) -> Engine:
+    """Variante do engine, com o mesmo pool, cujas transações são READ ONLY."""
+    if sync_engine not in _read_only_engines:
+        # O asyncpg abre a transação já como `BEGIN READ ONLY`, sem round trip extra
+        _read_only_engines[sync_engine] = sync_engine.execution_options(postgresql_readonly=True)
+    return _read_only_engines[sync_engine]
+
+
+class RoutingSession(Session):
+    """
+    Sessão que envia SELECTs para uma réplica e todo o resto para o primário.
+
+    A réplica é fixada na primeira leitura. Depois de qualquer escrita (flush,
+    UPDATE, SELECT ... FOR UPDATE) a sessão passa a usar só o primário, para que a
+    requisição leia o que acabou de escrever.
+    """
+
+    read_only = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.info.get(_USE_PRIMARY_KEY) or self._flushing or not _is_plain_read(clause):
+            self.info[_USE_PRIMARY_KEY] = True
+            return self._bind(engine.sync_engine)
+
+        if _REPLICA_KEY not in self.info:
+            replica = replicas.choose()
+            self.info[_REPLICA_KEY] = replica.sync_engine if replica else engine.sync_engine
+        return self._bind(self.info[_REPLICA_KEY])
+
+    def _bind(self, sync_engine: Engine) -> Engine:
+        return _read_only(sync_engine) if self.read_only else sync_engine
+
+
+class ReadOnlyRoutingSession(RoutingSession):
+    """`RoutingSession` em que toda transação é `READ ONLY`; escritas falham no banco."""
+
+    read_only = True
+
+
+def _is_plain_read(clause) -> bool:
+    return isinstance(clause, Select) and clause._for_update_arg is None
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _connect_replica(orm_execute_state) -> None:
+    """
+    Escolhe a réplica e abre a conexão antes da primeira leitura da sessão.
+
+    Se a conexão falhar, a réplica sai da rotação e a leitura vai para o primário,
+    em vez de a requisição responder 500. Uma réplica que cai depois de conectada
+    ainda derruba a requisição em andamento.
+    """
+    session = orm_execute_state.session
+    if (
+        _REPLICA_KEY in session.info
+        or session.info.get(_USE_PRIMARY_KEY)
+        or not _is_plain_read(orm_execute_state.statement)
+    ):
+        return
+
+    replica = replicas.choose()
+    if replica is not None:
+        try:
+            session.connection(bind_arguments={"bind": session._bind(replica.sync_engine)})
+        except Exception as exc:
+            replicas.mark_unhealthy(replica.sync_engine)
+            logger.warning(
+                "Réplica %s:%s indisponível; lendo do primário: %s",
+                replica.url.host,
+                replica.url.port,
+                exc,
+            )
+            replica = None
+    session.info[_REPLICA_KEY] = replica.sync_engine if replica else engine.sync_engine
+
+
+def use_primary(session: AsyncSession) -> None:
+    """Força as próximas queries da sessão a irem para o primário (read-your-writes)."""
+    session.info[_USE_PRIMARY_KEY] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session: Session, flush_context) -> None:
+    session.info[_HAS_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_write(orm_execute_state) -> None:
+    # Qualquer coisa que não seja SELECT (UPDATE/INSERT em lote, text()) conta como escrita
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[_HAS_WRITES_KEY] = True
+
+
+def _has_writes(session: AsyncSession) -> bool:
+    return bool(
+        session.info.get(_HAS_WRITES_KEY) or session.new or session.dirty or session.deleted
+    )
 
-engine = create_async_engine(settings.database_url, echo=False, future=True)
 
 async_session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+read_session_factory = async_sessionmaker(
+    class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False
+)
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency que fornece uma sessão async do banco de dados."""
-    async with async_session_factory() as session:
+read_only_session_factory = async_sessionmaker(
+    class_=AsyncSession, sync_session_class=ReadOnlyRoutingSession, expire_on_commit=False
+)
+
+
+def pool_stats() -> dict[str, dict]:
+    """Ocupação dos pools e tempo de espera por conexão neste processo."""
+    return {"primary": engine.pool.stats(), "replicas": replicas.stats()}
+
+
+async def warm_up_engine(
+    target: AsyncEngine,
+    connections: int,
+    statements: Callable[[AsyncSession], Awaitable[None]],
+) -> None:
+    """
+    Abre `connections` conexões do pool ao mesmo tempo e executa `statements` em cada.
+
+    Paga antes da primeira requisição o handshake, a introspecção de tipos do asyncpg
+    (ex.: enums) e a preparação das queries, cujo cache é por conexão. Tudo termina
+    em rollback.
+    """
+    connections = min(connections, target.pool.size())
+
+    async def warm_up_connection() -> None:
+        async with target.connect() as conn:
+            async with AsyncSession(bind=conn) as session:
+                await statements(session)
+            await conn.rollback()
+
+    await asyncio.gather(*(warm_up_connection() for _ in range(connections)))
+
+
+async def dispose_engines() -> None:
+    """Fecha as conexões do primário e das réplicas; usado no desligamento."""
+    await engine.dispose()
+    for replica in replicas.engines:
+        await replica.dispose()
+
+
+@asynccontextmanager
+async def _session_scope(factory: async_sessionmaker) -> AsyncIterator[AsyncSession]:
+    # A conexão só é retirada do pool na primeira query. Sem escritas não há o
+    # que commitar: fechar a sessão devolve a conexão e encerra a transação.
+    async with factory() as session:
         try:
             yield session
-            await session.commit()
+            if _has_writes(session):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency que fornece uma sessão async do banco de dados."""
+    async with _session_scope(async_session_factory) as session:
+        yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency para endpoints de leitura: as consultas vão para as réplicas, se
+    configuradas, e eventuais escritas continuam indo para o primário.
+    """
+    async with _session_scope(read_session_factory) as session:
+        yield session
+
+
+async def get_read_only_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency para endpoints somente leitura (`SET TRANSACTION READ ONLY`), com
+    leituras nas réplicas quando configuradas.
+
+    Use com `Depends(get_read_only_db, scope="function")` para devolver a conexão
+    ao pool assim que o endpoint retornar, antes da serialização da resposta.
+    """
+    async with _session_scope(read_only_session_factory) as session:
+        yield session
@@ -0,0 +1,276 @@
+"""
+Métricas no formato do Prometheus, expostas em `/metrics`.
+
+Ativadas com `METRICS_ENABLED=true` (requer `pip install prometheus-client`).
+
+Com vários workers (`uvicorn --workers` ou gunicorn), exporte a variável de
+ambiente `PROMETHEUS_MULTIPROC_DIR` apontando para um diretório vazio e gravável
+antes de iniciar o servidor: cada processo grava suas séries em arquivos e o
+`/metrics` de qualquer worker agrega todos.
+"""
+
+import os
+import time
+from collections.abc import Callable
+from functools import wraps
+from typing import ParamSpec, TypeVar
+
+from fastapi import FastAPI, Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.database import engine, replicas
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+AUTH_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+SQL_OPERATIONS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Metrics:
+    """Métricas da aplicação; as séries são criadas uma vez por processo."""
+
+    def __init__(self):
+        try:
+            import prometheus_client as prometheus
+        except ImportError as exc:
+            raise RuntimeError(
+                "METRICS_ENABLED=true requer o pacote `prometheus-client` "
+                "(pip install prometheus-client)"
+            ) from exc
+
+        self.prometheus = prometheus
+        Counter, Gauge, Histogram = prometheus.Counter, prometheus.Gauge, prometheus.Histogram
+
+        # HTTP
+        self.http_requests = Counter(
+            "http_requests_total", "Requisições HTTP concluídas.", ["method", "route", "status"]
+        )
+        self.http_duration = Histogram(
+            "http_request_duration_seconds",
+            "Duração das requisições HTTP.",
+            ["method", "route"],
+            buckets=HTTP_BUCKETS,
+        )
+        self.http_in_progress = Gauge(
+            "http_requests_in_progress",
+            "Requisições HTTP em andamento.",
+            ["method"],
+            multiprocess_mode="livesum",
+        )
+
+        # Banco de dados
+        self.db_query_duration = Histogram(
+            "db_query_duration_seconds",
+            "Duração das queries no banco.",
+            ["engine", "operation"],
+            buckets=DB_BUCKETS,
+        )
+        self.db_query_errors = Counter("db_query_errors_total", "Queries que falharam.", ["engine"])
+        self.db_pool_wait = Histogram(
+            "db_pool_wait_seconds",
+            "Espera por uma conexão do pool (inclui abrir conexões novas).",
+            ["engine"],
+            buckets=DB_BUCKETS,
+        )
+        self.db_pool_in_use = Gauge(
+            "db_pool_connections_in_use",
+            "Conexões retiradas do pool.",
+            ["engine"],
+            multiprocess_mode="livesum",
+        )
+
+        # Autenticação
+        self.password_hash_duration = Histogram(
+            "password_hash_duration_seconds",
+            "Tempo de cálculo de hash/verificação de senhas.",
+            ["operation"],
+            buckets=AUTH_BUCKETS,
+        )
+        self.password_hash_queue_wait = Histogram(
+            "password_hash_queue_wait_seconds",
+            "Espera por um worker do pool de hashing.",
+            buckets=AUTH_BUCKETS,
+        )
+        self.password_hash_rejected = Counter(
+            "password_hash_rejected_total", "Chamadas recusadas com o pool de hashing cheio."
+        )
+        self.jwt_duration = Histogram(
+            "jwt_operation_duration_seconds",
+            "Tempo de emissão/decodificação de JWTs.",
+            ["operation"],
+            buckets=AUTH_BUCKETS,
+        )
+        self.jwt_errors = Counter(
+            "jwt_operation_errors_total", "JWTs inválidos ou expirados.", ["operation"]
+        )
+        self.rate_limited = Counter(
+            "rate_limit_rejected_total", "Requisições recusadas pelo limite (429).", ["scope"]
+        )
+
+    def render(self) -> tuple[bytes, str]:
+        """Conteúdo do `/metrics` e seu content type."""
+        prometheus = self.prometheus
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            from prometheus_client import multiprocess
+
+            registry = prometheus.CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = prometheus.REGISTRY
+        return prometheus.generate_latest(registry), prometheus.CONTENT_TYPE_LATEST
+
+
+metrics = Metrics() if settings.METRICS_ENABLED else None
+
+
+def timed_jwt(operation: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Mede a função de JWT decorada; sem métricas ativas, não há custo algum."""
+
+    def decorator(fn: Callable[P, R]) -> Callable[P, R]:
+        if metrics is None:
+            return fn
+
+        @wraps(fn)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            started_at = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                metrics.jwt_errors.labels(operation).inc()
+                raise
+            finally:
+                metrics.jwt_duration.labels(operation).observe(time.perf_counter() - started_at)
+
+        return wrapper
+
+    return decorator
+
+
+def record_password_hash(operation: str, queue_wait: float, duration: float) -> None:
+    if metrics is not None:
+        metrics.password_hash_queue_wait.observe(queue_wait)
+        metrics.password_hash_duration.labels(operation).observe(duration)
+
+
+def record_password_hash_rejected() -> None:
+    if metrics is not None:
+        metrics.password_hash_rejected.inc()
+
+
+def record_rate_limited(scope: str) -> None:
+    if metrics is not None:
+        metrics.rate_limited.labels(scope).inc()
+
+
+def _sql_operation(statement: str) -> str:
+    head = statement.lstrip()[:6].upper()
+    return next((operation for operation in SQL_OPERATIONS if head.startswith(operation)), "OTHER")
+
+
+def instrument_engine(target: AsyncEngine, name: str) -> None:
+    """Registra os eventos que medem queries e o pool de um engine."""
+    assert metrics is not None
+    sync_engine = target.sync_engine
+    query_duration = metrics.db_query_duration
+    in_use = metrics.db_pool_in_use.labels(name)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+        query_duration.labels(name, _sql_operation(statement)).observe(elapsed)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context) -> None:
+        if context.connection is not None:
+            started = context.connection.info.get("query_started_at")
+            if started:
+                started.pop()
+        metrics.db_query_errors.labels(name).inc()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        in_use.inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record) -> None:
+        in_use.dec()
+
+    pool_wait = metrics.db_pool_wait.labels(name)
+    target.pool.wait_listeners.append(pool_wait.observe)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede cada requisição HTTP.
+
+    A rota é registrada pelo template (`/users/{user_id}`), não pelo caminho real,
+    para manter a cardinalidade das séries limitada.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or metrics is None:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = metrics.http_in_progress.labels(method)
+        in_progress.inc()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            in_progress.dec()
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            metrics.http_duration.labels(method, route).observe(elapsed)
+            metrics.http_requests.labels(method, route, str(status_code)).inc()
+
+
+def setup_metrics(app: FastAPI) -> None:
+    """Instala o middleware, instrumenta os engines e expõe `/metrics`."""
+    assert metrics is not None
+    instrument_engine(engine, "primary")
+    for replica in replicas.engines:
+        instrument_engine(replica, f"{replica.url.host}:{replica.url.port}")
+
+    app.add_middleware(MetricsMiddleware)
+
+    async def metrics_endpoint() -> Response:
+        content, media_type = metrics.render()
+        return Response(content=content, media_type=media_type)
+
+    app.add_api_route("/metrics", metrics_endpoint, methods=["GET"], include_in_schema=False)
+
+
+def mark_process_dead(pid: int) -> None:
+    """
+    Descarta as séries de um worker encerrado (modo multiprocesso).
+
+    No gunicorn, chame no hook `child_exit` do arquivo de configuração.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,68 @@
+import time
+from collections.abc import Callable
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Pool de conexões que mede o tempo de espera por uma conexão.
+
+    O tempo inclui a abertura de novas conexões (overflow), então reflete o que a
+    requisição de fato aguarda antes da primeira query.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.connect_errors = 0
+        self.last_connect_error_at: float | None = None
+        # Recebem o tempo de espera (s) de cada checkout, ex.: histogramas de métricas
+        self.wait_listeners: list[Callable[[float], None]] = []
+
+    def recreate(self) -> "InstrumentedAsyncPool":
+        # `engine.dispose()` troca o pool por um novo; os listeners continuam valendo
+        pool = super().recreate()
+        pool.wait_listeners = self.wait_listeners
+        return pool
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started_at = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        except Exception:
+            # Falha ao abrir conexão (servidor fora do ar, recusada, DNS...)
+            self.connect_errors += 1
+            self.last_connect_error_at = time.monotonic()
+            raise
+
+        waited = time.perf_counter() - started_at
+        self.checkouts += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        for listener in self.wait_listeners:
+            listener(waited)
+        return entry
+
+    def stats(self) -> dict[str, float]:
+        checkouts = self.checkouts or 1
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            # `overflow()` começa em -pool_size; positivo indica conexões extras abertas
+            "overflow_in_use": max(self.overflow(), 0),
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "connect_errors": self.connect_errors,
+            "wait_avg_ms": self.wait_total / checkouts * 1000,
+            "wait_max_ms": self.wait_max * 1000,
+        }
@@ -0,0 +1,206 @@
+"""
+Profiler de SQL por requisição, para desenvolvimento e homologação.
+
+Ativado com `SQL_PROFILER_ENABLED=true`. Cada resposta recebe os cabeçalhos
+`X-SQL-Queries`, `X-SQL-Time-Ms` e `X-SQL-Repeated`, e as últimas requisições
+ficam disponíveis em `GET /debug/sql` (admin). Statements idênticos executados
+`SQL_PROFILER_REPEATED_THRESHOLD` vezes ou mais na mesma requisição são marcados
+como provável N+1. SELECTs acima de `SQL_PROFILER_SLOW_QUERY_MS` são registrados
+no log com o plano de `EXPLAIN (ANALYZE, BUFFERS)`, obtido após a resposta em uma
+conexão separada: o plano não enxerga escritas não commitadas da requisição.
+"""
+
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.database import engine, replicas
+
+logger = logging.getLogger(__name__)
+
+RECENT_PROFILES = 50
+DEBUG_PATH = "/debug/sql"
+
+
+@dataclass(slots=True)
+class StatementStats:
+    count: int = 0
+    total_ms: float = 0.0
+
+
+@dataclass(slots=True)
+class SlowQuery:
+    statement: str
+    parameters: Any
+    duration_ms: float
+    plan: list[str] | None = None
+
+
+@dataclass
+class RequestProfile:
+    """Queries executadas durante uma requisição, agrupadas pelo texto do statement."""
+
+    method: str
+    path: str
+    statements: dict[str, StatementStats] = field(default_factory=dict)
+    slow_queries: list[SlowQuery] = field(default_factory=list)
+
+    @property
+    def query_count(self) -> int:
+        return sum(stats.count for stats in self.statements.values())
+
+    @property
+    def total_ms(self) -> float:
+        return sum(stats.total_ms for stats in self.statements.values())
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        stats = self.statements.get(statement)
+        if stats is None:
+            stats = self.statements[statement] = StatementStats()
+        stats.count += 1
+        stats.total_ms += duration_ms
+
+    def repeated(self) -> dict[str, StatementStats]:
+        threshold = settings.SQL_PROFILER_REPEATED_THRESHOLD
+        return {sql: stats for sql, stats in self.statements.items() if stats.count >= threshold}
+
+    def summary(self) -> dict:
+        # Sem os parâmetros das queries, que podem conter dados pessoais
+        return {
+            "method": self.method,
+            "path": self.path,
+            "query_count": self.query_count,
+            "total_ms": round(self.total_ms, 3),
+            "repeated": [
+                {"statement": sql, "count": stats.count, "total_ms": round(stats.total_ms, 3)}
+                for sql, stats in self.repeated().items()
+            ],
+            "slow_queries": [
+                {
+                    "statement": slow.statement,
+                    "duration_ms": round(slow.duration_ms, 3),
+                    "plan": slow.plan,
+                }
+                for slow in self.slow_queries
+            ],
+        }
+
+
+_current_profile: ContextVar[RequestProfile | None] = ContextVar("sql_profile", default=None)
+
+recent_profiles: deque[dict] = deque(maxlen=RECENT_PROFILES)
+
+
+def instrument_engine(target: AsyncEngine) -> None:
+    """Registra os eventos que alimentam o profile da requisição atual."""
+    sync_engine = target.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        if _current_profile.get() is not None:
+            conn.info.setdefault("profiler_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        profile = _current_profile.get()
+        started = conn.info.get("profiler_started_at")
+        if profile is None or not started:
+            return
+
+        duration_ms = (time.perf_counter() - started.pop()) * 1000
+        profile.record(statement, duration_ms)
+        is_select = statement.lstrip()[:6].upper() == "SELECT"
+        if is_select and not executemany and duration_ms >= settings.SQL_PROFILER_SLOW_QUERY_MS:
+            profile.slow_queries.append(SlowQuery(statement, parameters, duration_ms))
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context) -> None:
+        if context.connection is not None:
+            started = context.connection.info.get("profiler_started_at")
+            if started:
+                started.pop()
+
+
+async def explain(slow: SlowQuery) -> None:
+    """Preenche `slow.plan`; o EXPLAIN ANALYZE executa a query de novo, no primário."""
+    try:
+        async with engine.connect() as conn:
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS) {slow.statement}", slow.parameters
+            )
+            slow.plan = [row[0] for row in result]
+            await conn.rollback()
+    except Exception as exc:
+        # `orig` é o erro do driver, sem os parâmetros que o SQLAlchemy anexa à mensagem
+        slow.plan = [f"EXPLAIN falhou: {getattr(exc, 'orig', exc)}"]
+
+
+async def _finish(profile: RequestProfile) -> None:
+    for sql, stats in profile.repeated().items():
+        logger.warning(
+            "Possível N+1 em %s %s: %d execuções (%.1f ms) de %s",
+            profile.method,
+            profile.path,
+            stats.count,
+            stats.total_ms,
+            sql,
+        )
+    for slow in profile.slow_queries:
+        await explain(slow)
+        logger.warning(
+            "Query lenta em %s %s (%.1f ms): %s\n%s",
+            profile.method,
+            profile.path,
+            slow.duration_ms,
+            slow.statement,
+            "\n".join(slow.plan or []),
+        )
+    recent_profiles.append(profile.summary())
+
+
+class SQLProfilerMiddleware:
+    """Middleware ASGI que abre um profile por requisição HTTP."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"] == DEBUG_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(method=scope["method"], path=scope["path"])
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers += [
+                    (b"x-sql-queries", str(profile.query_count).encode()),
+                    (b"x-sql-time-ms", f"{profile.total_ms:.1f}".encode()),
+                    (b"x-sql-repeated", str(len(profile.repeated())).encode()),
+                ]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            await _finish(profile)
+
+
+def setup_profiler(app: FastAPI) -> None:
+    """Instrumenta os engines e instala o middleware do profiler."""
+    instrument_engine(engine)
+    for replica in replicas.engines:
+        instrument_engine(replica)
+    app.add_middleware(SQLProfilerMiddleware)
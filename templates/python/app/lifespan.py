@@ -0,0 +1,139 @@
+"""
+Ciclo de vida da aplicação: aquecimento na inicialização e desligamento limpo.
+
+Antes de aceitar requisições, abre conexões do pool (primário e réplicas), prepara
+as queries mais usadas e carrega o backend de hashing de senhas, para que a
+primeira requisição de cada worker não pague esses custos, e cria as partições
+dos próximos meses de `refresh_tokens`, se a tabela for particionada. No
+desligamento, grava os refresh tokens pendentes e fecha pools, threads e conexões
+externas.
+"""
+
+import logging
+import time
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import STARTED_AT
+from app.auth.batching import refresh_token_batcher
+from app.auth.dependencies import create_access_token, decode_access_token
+from app.auth.enums import Role
+from app.auth.hashing import password_hash_executor
+from app.auth.partitions import ensure_partitions
+from app.auth.rate_limit import rate_limiter
+from app.auth.token_store import DatabaseRefreshTokenStore, close_refresh_token_store
+from app.core.config import settings
+from app.core.database import dispose_engines, engine, replicas, warm_up_engine
+from app.user.models import User
+from app.user.repository import UserRepository
+
+# Logger do uvicorn, que já sai em nível INFO
+logger = logging.getLogger("uvicorn.error")
+
+startup_stats: dict[str, float | None] = {
+    "import_ms": None,
+    "warm_up_ms": None,
+    "ready_ms": None,
+    "first_request_ms": None,
+}
+
+
+def _elapsed_ms(since: float) -> float:
+    return round((time.perf_counter() - since) * 1000, 1)
+
+
+async def _read_statements(session: AsyncSession) -> None:
+    # Mesmas construções das rotas quentes, com valores que não existem
+    missing_id = uuid.uuid4()
+    await session.get(User, missing_id)
+    await session.execute(select(User).where(User.email == "warm-up@invalid"))
+    await UserRepository(session).find_by_id(missing_id)
+
+
+async def _primary_statements(session: AsyncSession) -> None:
+    await _read_statements(session)
+    # UPDATE do refresh sem linhas afetadas; o aquecimento termina em rollback
+    await DatabaseRefreshTokenStore(session).consume(str(uuid.uuid4()), "0" * 64)
+
+
+async def warm_up() -> None:
+    connections = settings.DATABASE_POOL_WARMUP_CONNECTIONS
+    if connections:
+        try:
+            await warm_up_engine(engine, connections, _primary_statements)
+            for replica in replicas.engines:
+                await warm_up_engine(replica, connections, _read_statements)
+        except Exception as exc:
+            # O pool volta a conectar sob demanda; não impede a inicialização
+            logger.warning("Falha ao aquecer o pool de conexões: %s", exc)
+
+    if settings.REFRESH_TOKEN_STORE == "database":
+        try:
+            for name in await ensure_partitions():
+                logger.info("Partição criada: %s", name)
+        except Exception as exc:
+            # A partição DEFAULT recebe os tokens até o job de limpeza rodar
+            logger.warning("Falha ao criar as partições de refresh_tokens: %s", exc)
+
+    if settings.PASSWORD_HASH_WARMUP:
+        await password_hash_executor.warm_up()
+
+    decode_access_token(create_access_token(uuid.uuid4(), "warm-up@invalid", Role.USER))
+
+
+async def shutdown() -> None:
+    await refresh_token_batcher.close()
+    await close_refresh_token_store()
+    await rate_limiter.close()
+    password_hash_executor.shutdown()
+    await dispose_engines()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    warm_up_started_at = time.perf_counter()
+    startup_stats["import_ms"] = round((warm_up_started_at - STARTED_AT) * 1000, 1)
+    await warm_up()
+    startup_stats["warm_up_ms"] = _elapsed_ms(warm_up_started_at)
+    startup_stats["ready_ms"] = _elapsed_ms(STARTED_AT)
+    logger.info(
+        "Aplicação pronta em %.1f ms (importação %.1f ms, aquecimento %.1f ms)",
+        startup_stats["ready_ms"],
+        startup_stats["import_ms"],
+        startup_stats["warm_up_ms"],
+    )
+
+    try:
+        yield
+    finally:
+        await shutdown()
+
+
+class FirstRequestTimerMiddleware:
+    """Registra quanto tempo após o início do processo a primeira requisição terminou."""
+
+    def __init__(self, app):
+        self.app = app
+        self.done = False
+
+    async def __call__(self, scope, receive, send) -> None:
+        if self.done or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        await self.app(scope, receive, send)
+        if not self.done:
+            self.done = True
+            startup_stats["first_request_ms"] = _elapsed_ms(STARTED_AT)
+            logger.info(
+                "Primeira requisição (%s) concluída em %.1f ms, %.1f ms após o início",
+                scope["path"],
+                _elapsed_ms(started_at),
+                startup_stats["first_request_ms"],
+            )
@@ -1,8 +1,15 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.auth.dependencies import require_role
+from app.auth.enums import Role
+from app.auth.rate_limit import rate_limiter
 from app.auth.router import router as auth_router
 from app.core.config import settings
+from app.core.database import pool_stats
+from app.core.metrics import setup_metrics
+from app.core.profiler import DEBUG_PATH, recent_profiles, setup_profiler
+from app.lifespan import FirstRequestTimerMiddleware, lifespan, startup_stats
 from app.user.router import router as user_router
 
 app = FastAPI(
@@ -12,6 +19,7 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    lifespan=lifespan,
 )
 
 # CORS
@@ -23,6 +31,14 @@ app.add_middleware(
     allow_headers=["Content-Type", "Authorization"],
 )
 
+app.add_middleware(FirstRequestTimerMiddleware)
+
+if settings.METRICS_ENABLED:
+    setup_metrics(app)
+
+if settings.SQL_PROFILER_ENABLED:
+    setup_profiler(app)
+
 # Routers
 app.include_router(auth_router)
 app.include_router(user_router)
@@ -31,3 +47,29 @@ app.include_router(user_router)
 @app.get("/", tags=["health"])
 async def health_check():
     return {"status": "ok"}
+
+
+@app.get("/health/pool", tags=["health"])
+async def pool_health():
+    """Ocupação do pool de conexões e tempo de espera por conexão neste worker."""
+    return pool_stats()
+
+
+@app.get("/health/startup", tags=["health"])
+async def startup_health():
+    """Tempos de importação, aquecimento e da primeira requisição deste worker (ms)."""
+    return startup_stats
+
+
+@app.get("/health/rate-limit", tags=["health"])
+async def rate_limit_health():
+    """Requisições recusadas pelo limite de autenticação neste worker, por escopo."""
+    return rate_limiter.stats()
+
+
+if settings.SQL_PROFILER_ENABLED:
+
+    @app.get(DEBUG_PATH, tags=["debug"], dependencies=[Depends(require_role(Role.ADMIN))])
+    async def sql_profiles():
+        """Queries das últimas requisições: contagem, repetições (N+1) e queries lentas."""
+        return list(reversed(recent_profiles))
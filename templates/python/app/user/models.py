@@ -1,15 +1,51 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Enum, String
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Computed,
+    DateTime,
+    Enum,
+    Index,
+    Integer,
+    String,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
 from app.auth.enums import Role
 from app.common.base_model import BaseModel
+from app.common.search import TS_CONFIG
 
 
 class User(BaseModel):
-
     __tablename__ = "users"
+    __table_args__ = (
+        # Índices (coluna, id) para a paginação por keyset; parciais porque toda
+        # listagem filtra usuários não excluídos
+        *(
+            Index(
+                f"ix_users_{column}_id",
+                column,
+                "id",
+                postgresql_where=text("deleted_at IS NULL"),
+            )
+            for column in ("created_at", "name", "email", "is_active", "role")
+        ),
+        # Busca por substring (ILIKE via pg_trgm) e full-text
+        *(
+            Index(
+                f"ix_users_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_where=text("deleted_at IS NULL"),
+            )
+            for column in ("name", "email")
+        ),
+        Index("ix_users_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     email: str = Column(String, unique=True, nullable=False, index=True)
     name: str = Column(String, nullable=False)
@@ -19,8 +55,23 @@ class User(BaseModel):
     role: str = Column(Enum(Role, name="role_enum"), default=Role.USER, nullable=False)
     must_change_password: bool = Column(Boolean, default=False, nullable=False)
     deleted_at: datetime | None = Column(DateTime(timezone=True), nullable=True)
+    token_version: int = Column(Integer, default=0, server_default="0", nullable=False)
+    # Documento da busca full-text, mantido pelo Postgres e nunca carregado por padrão
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                f"to_tsvector('{TS_CONFIG}', coalesce(name, '') || ' ' || coalesce(email, ''))",
+                persisted=True,
+            ),
+        )
+    )
 
     # Relationships
+    # A exclusão em cascata fica com o banco (ON DELETE CASCADE), sem carregar os tokens
     refresh_tokens = relationship(
-        "RefreshToken", back_populates="user", cascade="all, delete-orphan"
+        "RefreshToken",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
@@ -1,10 +1,12 @@
 import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime
 
-from sqlalchemy import desc, func, or_, select
+from sqlalchemy import Select, desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.common.base_repository import BaseRepository
-from app.common.pagination import PaginatedResult, PaginationMeta
+from app.common.pagination import PaginatedResult
 from app.user.models import User
 from app.user.schemas import QueryUsersParams
 
@@ -12,6 +14,9 @@ from app.user.schemas import QueryUsersParams
 class UserRepository(BaseRepository[User]):
     """Repositório de usuários."""
 
+    search_columns = ("name", "email")
+    search_vector_column = "search_vector"
+
     def __init__(self, session: AsyncSession):
         super().__init__(User, session)
 
@@ -21,12 +26,25 @@ class UserRepository(BaseRepository[User]):
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def find_updated_at(self, id: uuid.UUID) -> datetime | None:
+        """Versão (`updated_at`) do usuário ativo, sem carregar a linha inteira."""
+        stmt = select(User.updated_at).where(User.id == id, User.deleted_at.is_(None))
+        return await self.session.scalar(stmt)
+
     async def find_all(self) -> list[User]:
         """Busca todos os usuários ativos."""
         stmt = select(User).where(User.deleted_at.is_(None)).order_by(desc(User.created_at))
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
+    def stream(
+        self, batch_size: int = 1000, stmt: Select | None = None
+    ) -> AsyncIterator[list[User]]:
+        """Percorre os usuários ativos em lotes (cursor do lado do servidor)."""
+        if stmt is None:
+            stmt = select(User).where(User.deleted_at.is_(None)).order_by(desc(User.created_at))
+        return super().stream(batch_size, stmt)
+
     async def find_by_email(self, email: str) -> User | None:
         """Busca usuário pelo email."""
         stmt = select(User).where(User.email == email)
@@ -38,40 +56,26 @@ class UserRepository(BaseRepository[User]):
         base_stmt = select(User).where(User.deleted_at.is_(None))
         count_stmt = select(func.count()).select_from(User).where(User.deleted_at.is_(None))
 
-        if query.search:
-            search_filter = or_(
-                User.name.ilike(f"%{query.search}%"),
-                User.email.ilike(f"%{query.search}%"),
-            )
-            base_stmt = base_stmt.where(search_filter)
-            count_stmt = count_stmt.where(search_filter)
+        base_stmt, count_stmt, rank = self._apply_search(
+            base_stmt, count_stmt, query.search, query.search_mode
+        )
 
         # Whitelist de colunas para ordenação
         allowed_columns = {"id", "name", "email", "is_active", "role", "created_at"}
+        if rank is not None:
+            allowed_columns.add("relevance")
         sort_col = query.sort_by if query.sort_by in allowed_columns else "created_at"
-        column = getattr(User, sort_col, User.created_at)
-        order = desc(column) if query.sort_order.value == "DESC" else column.asc()
-
-        base_stmt = base_stmt.order_by(order)
-        base_stmt = base_stmt.offset((query.page - 1) * query.limit).limit(query.limit)
-
-        total_result = await self.session.execute(count_stmt)
-        total_items = total_result.scalar() or 0
-
-        result = await self.session.execute(base_stmt)
-        users = list(result.scalars().all())
-
-        total_pages = (total_items + query.limit - 1) // query.limit if query.limit > 0 else 0
 
-        return PaginatedResult(
-            data=users,
-            meta=PaginationMeta(
-                total_items=total_items,
-                item_count=len(users),
-                items_per_page=query.limit,
-                total_pages=total_pages,
-                current_page=query.page,
-            ),
+        return await self._paginate(
+            base_stmt,
+            count_stmt,
+            page=query.page,
+            limit=query.limit,
+            sort_by=sort_col,
+            sort_order=query.sort_order.value,
+            cursor=query.cursor,
+            count_mode=query.count_mode,
+            sort_expression=rank if sort_col == "relevance" else None,
         )
 
     async def soft_delete(self, id: uuid.UUID) -> None:
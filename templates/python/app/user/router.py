@@ -1,15 +1,31 @@
 import uuid
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user, require_role
 from app.auth.enums import Role
-from app.core.database import get_db
+from app.auth.schemas import CurrentUser
+from app.common.etag import (
+    collection_etag,
+    entity_etag,
+    has_conditions,
+    is_not_modified,
+    last_modified_of,
+    not_modified,
+    version_etag,
+    with_validators,
+)
+from app.common.export import EXPORT_MEDIA_TYPES, ExportFormat, serialize_export
+from app.common.pagination import PaginatedResult
+from app.common.schemas import CountMode, SearchMode
+from app.common.serialization import entities_response, entity_response, paginated_response
+from app.core.database import get_db, get_read_only_db
 from app.user import service as user_service
-from app.user.models import User
 from app.user.schemas import (
     CreateUserRequest,
+    ImportUsersResponse,
     QueryUsersParams,
     UpdateUserRequest,
     UserResponse,
@@ -17,6 +33,22 @@ from app.user.schemas import (
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+NOT_MODIFIED_RESPONSE = {304: {"description": "Não modificado desde o ETag/data informados."}}
+
+
+async def _user_response(request: Request, db: AsyncSession, user_id: uuid.UUID) -> Response:
+    """Usuário com ETag/Last-Modified; o 304 sai de uma consulta só da versão."""
+    if has_conditions(request):
+        updated_at = await user_service.get_user_version(db, user_id)
+        if updated_at is not None:
+            etag = version_etag(user_id, updated_at, UserResponse)
+            if is_not_modified(request, etag, updated_at):
+                return not_modified(etag, updated_at)
+
+    user = await user_service.get_user_by_id(db, user_id)
+    response = entity_response(user, UserResponse)
+    return with_validators(response, entity_etag(user, UserResponse), user.updated_at)
+
 
 # --- Rotas do próprio usuário ---
 
@@ -25,13 +57,14 @@ router = APIRouter(prefix="/users", tags=["users"])
     "/me",
     response_model=UserResponse,
     summary="Retorna o perfil do usuário logado",
-    responses={200: {"description": "Perfil do usuário."}},
+    responses={200: {"description": "Perfil do usuário."}, **NOT_MODIFIED_RESPONSE},
 )
 async def get_me(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_only_db, scope="function"),
 ):
-    return await user_service.get_user_by_id(db, current_user.id)
+    return await _user_response(request, db, current_user.id)
 
 
 @router.patch(
@@ -42,7 +75,7 @@ async def get_me(
 )
 async def update_me(
     data: UpdateUserRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     return await user_service.update_user_profile(db, current_user.id, data)
@@ -60,38 +93,71 @@ async def update_me(
 )
 async def create_user(
     data: CreateUserRequest,
-    _admin: User = Depends(require_role(Role.ADMIN)),
+    _admin: CurrentUser = Depends(require_role(Role.ADMIN)),
     db: AsyncSession = Depends(get_db),
 ):
     return await user_service.create_user(db, data)
 
 
+@router.post(
+    "/import",
+    response_model=ImportUsersResponse,
+    summary="Importa usuários em lote de um arquivo CSV ou NDJSON (admin)",
+    responses={200: {"description": "Resumo da importação."}},
+)
+async def import_users(
+    file: UploadFile = File(...),
+    import_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    _admin: CurrentUser = Depends(require_role(Role.ADMIN)),
+    db: AsyncSession = Depends(get_db),
+):
+    return await user_service.import_users(db, file.file, import_format)
+
+
 @router.get(
     "/",
     response_model=list[UserResponse],
     summary="Busca todos os usuários",
-    responses={200: {"description": "Lista de usuários retornada com sucesso."}},
+    responses={
+        200: {"description": "Lista de usuários retornada com sucesso."},
+        **NOT_MODIFIED_RESPONSE,
+    },
 )
 async def find_all(
-    _admin: User = Depends(require_role(Role.ADMIN)),
+    request: Request,
+    _admin: CurrentUser = Depends(require_role(Role.ADMIN)),
     db: AsyncSession = Depends(get_db),
 ):
-    return await user_service.get_all_users(db)
+    users = await user_service.get_all_users(db)
+    etag = collection_etag(users, UserResponse, "all")
+    last_modified = last_modified_of(users)
+    # Listagens só validam pelo ETag: remover um item não altera o maior updated_at
+    if is_not_modified(request, etag):
+        return not_modified(etag, last_modified)
+    return with_validators(entities_response(users, UserResponse), etag, last_modified)
 
 
 @router.get(
     "/paginated",
+    response_model=PaginatedResult[UserResponse],
     summary="Busca todos os usuários com paginação",
-    responses={200: {"description": "Lista de usuários retornada com sucesso."}},
+    responses={
+        200: {"description": "Lista de usuários retornada com sucesso."},
+        **NOT_MODIFIED_RESPONSE,
+    },
 )
 async def find_paginated(
+    request: Request,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
     search: str | None = Query(None),
+    search_mode: SearchMode = Query(SearchMode.SUBSTRING),
     sort_by: str = Query("id"),
     sort_order: str = Query("ASC"),
-    _admin: User = Depends(require_role(Role.ADMIN)),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(None),
+    count_mode: CountMode = Query(CountMode.EXACT),
+    _admin: CurrentUser = Depends(require_role(Role.ADMIN)),
+    db: AsyncSession = Depends(get_read_only_db, scope="function"),
 ):
     from app.common.schemas import SortOrder as SortOrderEnum
 
@@ -99,10 +165,37 @@ async def find_paginated(
         page=page,
         limit=limit,
         search=search,
+        search_mode=search_mode,
         sort_by=sort_by,
         sort_order=SortOrderEnum(sort_order.upper()),
+        cursor=cursor,
+        count_mode=count_mode,
+    )
+    result = await user_service.get_users_paginated(db, query)
+    signature = (query.model_dump(), result.meta.model_dump(), result.next_cursor)
+    etag = collection_etag(result.data, UserResponse, signature)
+    last_modified = last_modified_of(result.data)
+    if is_not_modified(request, etag):
+        return not_modified(etag, last_modified)
+    return with_validators(paginated_response(result, UserResponse), etag, last_modified)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Exporta todos os usuários em NDJSON ou CSV (admin)",
+    responses={200: {"description": "Arquivo de exportação gerado em streaming."}},
+)
+async def export_users(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    _admin: CurrentUser = Depends(require_role(Role.ADMIN)),
+):
+    content = serialize_export(user_service.export_users(), UserResponse, export_format)
+    return StreamingResponse(
+        content,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="users.{export_format}"'},
     )
-    return await user_service.get_users_paginated(db, query)
 
 
 @router.get(
@@ -111,15 +204,17 @@ async def find_paginated(
     summary="Busca usuário pelo Id",
     responses={
         200: {"description": "Usuário encontrado."},
+        **NOT_MODIFIED_RESPONSE,
         404: {"description": "Usuário não encontrado."},
     },
 )
 async def find_by_id(
+    request: Request,
     user_id: uuid.UUID,
-    _admin: User = Depends(require_role(Role.ADMIN)),
-    db: AsyncSession = Depends(get_db),
+    _admin: CurrentUser = Depends(require_role(Role.ADMIN)),
+    db: AsyncSession = Depends(get_read_only_db, scope="function"),
 ):
-    return await user_service.get_user_by_id(db, user_id)
+    return await _user_response(request, db, user_id)
 
 
 @router.patch(
@@ -131,7 +226,7 @@ async def find_by_id(
 async def update_user(
     user_id: uuid.UUID,
     data: UpdateUserRequest,
-    _admin: User = Depends(require_role(Role.ADMIN)),
+    _admin: CurrentUser = Depends(require_role(Role.ADMIN)),
     db: AsyncSession = Depends(get_db),
 ):
     await user_service.update_user_profile(db, user_id, data)
@@ -147,7 +242,7 @@ async def update_user(
 )
 async def reset_password(
     user_id: uuid.UUID,
-    _admin: User = Depends(require_role(Role.ADMIN)),
+    _admin: CurrentUser = Depends(require_role(Role.ADMIN)),
     db: AsyncSession = Depends(get_db),
 ):
     return await user_service.reset_password_by_admin(db, user_id)
@@ -164,7 +259,7 @@ async def reset_password(
 )
 async def delete_user(
     user_id: uuid.UUID,
-    _admin: User = Depends(require_role(Role.ADMIN)),
+    _admin: CurrentUser = Depends(require_role(Role.ADMIN)),
     db: AsyncSession = Depends(get_db),
 ):
     await user_service.delete_user(db, user_id)
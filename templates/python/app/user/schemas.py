@@ -47,6 +47,27 @@ class UserResponse(BaseModel):
     must_change_password: bool
 
 
+# --- Import ---
+
+
+class ImportRowError(BaseModel):
+    """Linha rejeitada na importação em lote."""
+
+    line: int
+    detail: str
+
+
+class ImportUsersResponse(BaseModel):
+    """Resultado da importação em lote de usuários."""
+
+    created: int
+    skipped: int = Field(description="Linhas ignoradas por e-mail já cadastrado ou repetido.")
+    errors: list[ImportRowError] = Field(
+        default_factory=list, description="Linhas inválidas (limitado às primeiras 100)."
+    )
+    total_errors: int = 0
+
+
 # --- Query ---
 
 
@@ -56,5 +77,5 @@ class QueryUsersParams(BaseQueryParams):
     sort_by: str = Field(
         default="id",
         description="Coluna de ordenação.",
-        json_schema_extra={"enum": ["id", "name", "email", "is_active", "role"]},
+        json_schema_extra={"enum": ["id", "name", "email", "is_active", "role", "relevance"]},
     )
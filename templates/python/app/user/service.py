@@ -1,28 +1,89 @@
 import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import BinaryIO
 
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import case, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.service import hash_password
+from app.auth.cache import invalidate_user
+from app.auth.hashing import hash_password_async
+from app.auth.revocation import record_token_version, revoke_user_tokens
 from app.common.errors import ERRORS
+from app.common.export import ExportFormat, ImportFileError, iter_import_rows
 from app.common.pagination import PaginatedResult
 from app.core.config import settings
+from app.core.database import read_session_factory
 from app.user.models import User
 from app.user.repository import UserRepository
-from app.user.schemas import CreateUserRequest, QueryUsersParams, UpdateUserRequest
+from app.user.schemas import (
+    CreateUserRequest,
+    ImportRowError,
+    ImportUsersResponse,
+    QueryUsersParams,
+    UpdateUserRequest,
+)
+
+IMPORT_BATCH_SIZE = 1000
+IMPORT_MAX_REPORTED_ERRORS = 100
+
+# Claims de autorização do access token; alterá-las revoga os tokens já emitidos
+_TOKEN_CLAIM_FIELDS = {"role", "is_active"}
 
 
 async def create_user(db: AsyncSession, data: CreateUserRequest) -> User:
     """Cria um novo usuário com senha padrão."""
     repo = UserRepository(db)
 
-    existing = await repo.find_by_email(data.email)
-    if existing:
+    default_password = settings.DEFAULT_PASSWORD
+    if not default_password:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=ERRORS["USER"]["DEFAULT_PASSWORD_NOT_SET"],
+        )
+
+    hashed = await hash_password_async(default_password)
+
+    # A unicidade do e-mail é verificada pelo próprio INSERT (ON CONFLICT)
+    user = await repo.create_if_not_exists(
+        {
+            **data.model_dump(exclude_unset=True),
+            "password": hashed,
+            "must_change_password": True,
+        },
+        conflict_columns=("email",),
+    )
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"{ERRORS['USER']['EMAIL_IN_USE']} (Email: {data.email})",
         )
+    return user
+
+
+def _import_row(user: CreateUserRequest) -> dict:
+    # Todas as colunas em todas as linhas, já que o INSERT multi-linha usa as chaves da
+    # primeira; um null explícito (ex.: "role": null) vale o padrão do schema
+    return {
+        key: value if value is not None else CreateUserRequest.model_fields[key].default
+        for key, value in user.model_dump().items()
+    }
 
+
+async def import_users(
+    db: AsyncSession, file: BinaryIO, import_format: ExportFormat
+) -> ImportUsersResponse:
+    """
+    Importa usuários de um arquivo CSV/NDJSON em lotes.
+
+    O arquivo é validado em uma única passada, linha a linha, em um thread fora do
+    event loop. Cada lote recebe um único hash da senha padrão e é gravado com um
+    INSERT multi-linha; e-mails já cadastrados são ignorados (`ON CONFLICT DO NOTHING`).
+    Um CSV ilegível resulta em 400 e nada é importado.
+    """
     default_password = settings.DEFAULT_PASSWORD
     if not default_password:
         raise HTTPException(
@@ -30,13 +91,63 @@ async def create_user(db: AsyncSession, data: CreateUserRequest) -> User:
             detail=ERRORS["USER"]["DEFAULT_PASSWORD_NOT_SET"],
         )
 
-    hashed = hash_password(default_password)
+    repo = UserRepository(db)
+    report = ImportUsersResponse(created=0, skipped=0)
+    batch: dict[str, dict] = {}
+
+    def add_error(line: int, detail: str) -> None:
+        report.total_errors += 1
+        if len(report.errors) < IMPORT_MAX_REPORTED_ERRORS:
+            report.errors.append(ImportRowError(line=line, detail=detail))
+
+    async def flush() -> None:
+        hashed = await hash_password_async(default_password)
+        rows = [{**row, "password": hashed, "must_change_password": True} for row in batch.values()]
+        created = await repo.bulk_create(rows, conflict_columns=("email",))
+        report.created += len(created)
+        report.skipped += len(rows) - len(created)
+        batch.clear()
+
+    rows = iter_import_rows(file, import_format)
+
+    def read_batch() -> bool:
+        """Lê e valida linhas até encher o lote; False quando o arquivo termina."""
+        for line, data, error in rows:
+            if error:
+                add_error(line, error)
+                continue
+            try:
+                user = CreateUserRequest.model_validate(data)
+            except ValidationError as exc:
+                details = "; ".join(
+                    f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors()
+                )
+                add_error(line, details)
+                continue
+
+            if user.email in batch:
+                report.skipped += 1
+                continue
+            batch[user.email] = _import_row(user)
+
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                return True
+        return False
+
+    try:
+        while await run_in_threadpool(read_batch):
+            await flush()
+    except ImportFileError as exc:
+        # A sessão faz rollback dos lotes já gravados
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{ERRORS['USER']['INVALID_IMPORT_FILE']} ({exc})",
+        ) from exc
+
+    if batch:
+        await flush()
 
-    return await repo.create({
-        **data.model_dump(exclude_unset=True),
-        "password": hashed,
-        "must_change_password": True,
-    })
+    return report
 
 
 async def get_user_by_id(db: AsyncSession, user_id: uuid.UUID) -> User:
@@ -51,12 +162,31 @@ async def get_user_by_id(db: AsyncSession, user_id: uuid.UUID) -> User:
     return user
 
 
+async def get_user_version(db: AsyncSession, user_id: uuid.UUID) -> datetime | None:
+    """`updated_at` do usuário, para GETs condicionais; None se não existir."""
+    repo = UserRepository(db)
+    return await repo.find_updated_at(user_id)
+
+
 async def get_all_users(db: AsyncSession) -> list[User]:
     """Lista todos os usuários ativos."""
     repo = UserRepository(db)
     return await repo.find_all()
 
 
+async def export_users(batch_size: int = 1000) -> AsyncIterator[list[User]]:
+    """
+    Lotes de usuários ativos para exportação em streaming.
+
+    Usa uma sessão própria: o corpo da resposta é gerado depois que o endpoint
+    retorna, quando a sessão da dependency `get_db` pode já ter sido fechada.
+    """
+    async with read_session_factory() as session:
+        repo = UserRepository(session)
+        async for batch in repo.stream(batch_size):
+            yield batch
+
+
 async def get_users_paginated(db: AsyncSession, query: QueryUsersParams) -> PaginatedResult[User]:
     """Lista usuários com paginação e busca."""
     repo = UserRepository(db)
@@ -68,19 +198,28 @@ async def update_user_profile(
 ) -> User:
     """Atualiza o perfil de um usuário."""
     repo = UserRepository(db)
-    user = await repo.find_by_id(user_id)
+
+    update_data = data.model_dump(exclude_unset=True)
+    claims = {key: value for key, value in update_data.items() if key in _TOKEN_CLAIM_FIELDS}
+    if claims:
+        # Incrementa o token_version no mesmo UPDATE se alguma claim mudar de fato
+        claims_changed = or_(
+            *(getattr(User, key).is_distinct_from(value) for key, value in claims.items())
+        )
+        update_data["token_version"] = User.token_version + case((claims_changed, 1), else_=0)
+
+    user = await repo.update(user_id, update_data, skip_none=False, include_deleted=False)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=ERRORS["USER"]["NOT_FOUND"],
         )
 
-    update_data = data.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(user, key, value)
+    if claims:
+        record_token_version(db, user)
+    else:
+        invalidate_user(db, user_id)
 
-    await db.flush()
-    await db.refresh(user)
     return user
 
 
@@ -95,8 +234,9 @@ async def reset_password_by_admin(db: AsyncSession, user_id: uuid.UUID) -> dict:
             detail=ERRORS["USER"]["DEFAULT_PASSWORD_NOT_SET"],
         )
 
-    user.password = hash_password(default_password)
+    user.password = await hash_password_async(default_password)
     user.must_change_password = True
+    revoke_user_tokens(db, user)
     await db.flush()
 
     return {"message": f"A senha do usuário {user.name} foi resetada com sucesso"}
@@ -111,4 +251,5 @@ async def delete_user(db: AsyncSession, user_id: uuid.UUID) -> None:
             status_code=status.HTTP_404_NOT_FOUND,
             detail=ERRORS["USER"]["NOT_FOUND"],
         )
+    revoke_user_tokens(db, user)
     await repo.soft_delete(user_id)
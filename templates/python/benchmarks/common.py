@@ -0,0 +1,77 @@
+import json
+import math
+from pathlib import Path
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+
+# Métricas em que valores maiores são melhores; nas demais (latências), menores
+HIGHER_IS_BETTER = {"rps", "ops_per_second"}
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Percentil pelo método nearest-rank."""
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def load_baselines(path: Path = BASELINES_PATH) -> dict:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baselines(suite: str, results: dict[str, dict[str, float]], path: Path = BASELINES_PATH):
+    """Grava os resultados de `suite` como nova referência, mantendo as demais suítes."""
+    baselines = load_baselines(path)
+    baselines[suite] = results
+    path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+
+
+def compare(
+    suite: str, results: dict[str, dict[str, float]], tolerance: float, path: Path = BASELINES_PATH
+) -> list[str]:
+    """
+    Compara os resultados com a referência gravada e retorna as regressões.
+
+    Uma métrica regride quando piora mais que `tolerance` (ex.: 0.2 = 20%).
+    Benchmarks ou métricas sem referência são ignorados.
+    """
+    baseline = load_baselines(path).get(suite, {})
+    regressions = []
+
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            reference = baseline.get(name, {}).get(metric)
+            if not reference:
+                continue
+            if metric in HIGHER_IS_BETTER:
+                regressed = value < reference * (1 - tolerance)
+            else:
+                regressed = value > reference * (1 + tolerance)
+            if regressed:
+                regressions.append(f"{name} {metric}: {value:.2f} (referência {reference:.2f})")
+
+    return regressions
+
+
+def report(suite: str, results: dict, tolerance: float, update_baseline: bool) -> int:
+    """Compara ou grava a referência; retorna o código de saída do script."""
+    if update_baseline:
+        save_baselines(suite, results)
+        print(f"\nReferência de '{suite}' gravada em {BASELINES_PATH.name}")
+        return 0
+
+    if suite not in load_baselines():
+        print(f"\nSem referência para '{suite}'; grave uma com --update-baseline")
+        return 0
+
+    regressions = compare(suite, results, tolerance)
+    if regressions:
+        print(f"\nRegressões acima de {tolerance:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+
+    print(f"\nSem regressões acima de {tolerance:.0%}")
+    return 0
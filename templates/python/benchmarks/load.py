@@ -0,0 +1,177 @@
+"""
+Carga em processo nos endpoints de autenticação e usuários (httpx + ASGI).
+
+Uso:
+    docker compose up -d postgres && alembic upgrade head
+    python -m benchmarks.load
+    python -m benchmarks.load users_me users_paginated --requests 2000 --concurrency 50
+    python -m benchmarks.load --update-baseline
+
+As requisições passam pela aplicação inteira (middlewares, dependências, banco),
+sem rede nem servidor HTTP. Usa o banco configurado no `.env` e cria (ou
+reativa) o usuário admin `bench-admin@innovationhub.local`: não rode em produção.
+O script termina com código 1 se alguma requisição falhar ou se p50/p95/p99 ou
+RPS piorarem além da tolerância em relação a `benchmarks/baselines.json`.
+"""
+
+import argparse
+import asyncio
+import itertools
+import sys
+import time
+from collections.abc import Awaitable, Callable
+
+import httpx
+
+from app.auth.enums import Role
+from app.auth.hashing import hash_password
+from app.auth.service import generate_auth_response
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.main import app
+from app.user.models import User
+from app.user.repository import UserRepository
+from benchmarks.common import percentile, report
+
+SUITE = "load"
+BENCH_EMAIL = "bench-admin@innovationhub.local"
+BENCH_PASSWORD = "senha-de-benchmark"
+SCENARIOS = ("auth_login", "auth_refresh", "users_me", "users_paginated")
+
+Send = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+async def prepare_user() -> User:
+    """Cria ou reativa o admin usado na carga, com a senha conhecida."""
+    async with async_session_factory() as db:
+        users = await UserRepository(db).bulk_upsert(
+            [
+                {
+                    "email": BENCH_EMAIL,
+                    "name": "Benchmark",
+                    "password": hash_password(BENCH_PASSWORD),
+                    "role": Role.ADMIN,
+                    "is_active": True,
+                    "must_change_password": False,
+                    "deleted_at": None,
+                }
+            ],
+            conflict_columns=("email",),
+        )
+        await db.commit()
+        return users[0]
+
+
+async def issue_tokens(user: User, count: int) -> tuple[str, list[str]]:
+    """Emite `count` sessões direto pelo serviço, sem pagar o hashing do login."""
+    async with async_session_factory() as db:
+        responses = [await generate_auth_response(db, user) for _ in range(count)]
+        await db.commit()
+    return responses[0].access_token, [response.refresh_token for response in responses]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, send: Send, requests: int, concurrency: int, warmup: int
+) -> tuple[dict[str, float], int]:
+    """Executa `requests` chamadas com `concurrency` clientes; retorna métricas e erros."""
+    for index in range(warmup):
+        await send(client, index)
+
+    latencies: list[float] = []
+    errors = 0
+    counter = itertools.count()
+
+    async def worker() -> None:
+        nonlocal errors
+        while (index := next(counter)) < requests:
+            started_at = time.perf_counter()
+            response = await send(client, warmup + index)
+            latencies.append((time.perf_counter() - started_at) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    metrics = {
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "rps": requests / elapsed,
+    }
+    return metrics, errors
+
+
+async def run(names: list[str], requests: int, concurrency: int, warmup: int) -> tuple[dict, int]:
+    # Mesmo ciclo de vida do servidor: aquecimento antes e descarte dos pools depois
+    async with app.router.lifespan_context(app):
+        return await run_scenarios(names, requests, concurrency, warmup)
+
+
+async def run_scenarios(
+    names: list[str], requests: int, concurrency: int, warmup: int
+) -> tuple[dict, int]:
+    # Todas as requisições vêm do mesmo IP e e-mail: sem isso, o 429 domina a medição
+    settings.RATE_LIMIT_ENABLED = False
+    user = await prepare_user()
+    sessions = requests + warmup if not names or "auth_refresh" in names else 1
+    access_token, refresh_tokens = await issue_tokens(user, sessions)
+    auth = {"Authorization": f"Bearer {access_token}"}
+
+    scenarios: dict[str, Send] = {
+        "auth_login": lambda client, _: client.post(
+            "/auth/login", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD}
+        ),
+        # Cada refresh consome o token, então cada requisição usa uma sessão própria
+        "auth_refresh": lambda client, index: client.post(
+            "/auth/refresh", json={"refresh_token": refresh_tokens[index]}
+        ),
+        "users_me": lambda client, _: client.get("/users/me", headers=auth),
+        "users_paginated": lambda client, _: client.get(
+            "/users/paginated", params={"page": 1, "limit": 20}, headers=auth
+        ),
+    }
+
+    results = {}
+    total_errors = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'cenário':<18}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'erros':>8}")
+        for name, send in scenarios.items():
+            if names and name not in names:
+                continue
+            metrics, errors = await run_scenario(client, send, requests, concurrency, warmup)
+            results[name] = metrics
+            total_errors += errors
+            print(
+                f"{name:<18}{metrics['p50_ms']:>10.2f}{metrics['p95_ms']:>10.2f}"
+                f"{metrics['p99_ms']:>10.2f}{metrics['rps']:>10.1f}{errors:>8}"
+            )
+
+    return results, total_errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("names", nargs="*", help="cenários a executar (padrão: todos)")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    unknown = set(args.names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"cenários desconhecidos: {', '.join(sorted(unknown))}")
+
+    results, errors = asyncio.run(run(args.names, args.requests, args.concurrency, args.warmup))
+    if errors:
+        print(f"\n{errors} requisições falharam; resultados descartados")
+        sys.exit(1)
+    sys.exit(report(SUITE, results, args.tolerance, args.update_baseline))
+
+
+if __name__ == "__main__":
+    main()
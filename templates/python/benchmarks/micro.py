@@ -0,0 +1,117 @@
+"""
+Micro-benchmarks de JWT, hashing de senhas, slugs e serialização de usuários.
+
+Uso:
+    python -m benchmarks.micro
+    python -m benchmarks.micro create_access_token decode_access_token
+    python -m benchmarks.micro --update-baseline
+    python -m benchmarks.micro --tolerance 0.3
+
+Cada benchmark é repetido `--repeat` vezes e vale o melhor resultado, o menos
+afetado por ruído. O script termina com código 1 se algum benchmark ficar mais
+lento que a referência em `benchmarks/baselines.json` além da tolerância.
+"""
+
+import argparse
+import sys
+import timeit
+import uuid
+from collections.abc import Callable
+
+import orjson
+
+from app.auth.dependencies import create_access_token, decode_access_token
+from app.auth.enums import Role
+from app.auth.hashing import hash_password, verify_password
+from app.common.serialization import dump_entity
+from app.common.utils import create_slug
+from app.user.schemas import UserResponse
+from benchmarks.common import report
+from benchmarks.serialization import build_users
+
+SUITE = "micro"
+
+
+PASSWORD = "senha-de-benchmark"
+EMAIL = "bench@example.com"
+TITLE = "Inovação e Tecnologia: o Futuro das Startups no Brasil"
+
+
+def bench_create_access_token() -> Callable[[], object]:
+    user_id = uuid.uuid4()
+    return lambda: create_access_token(user_id, EMAIL, Role.USER)
+
+
+def bench_decode_access_token() -> Callable[[], object]:
+    token = create_access_token(uuid.uuid4(), EMAIL, Role.USER)
+    return lambda: decode_access_token(token)
+
+
+def bench_hash_password() -> Callable[[], object]:
+    return lambda: hash_password(PASSWORD)
+
+
+def bench_verify_password() -> Callable[[], object]:
+    password_hash = hash_password(PASSWORD)
+    return lambda: verify_password(PASSWORD, password_hash)
+
+
+def bench_create_slug() -> Callable[[], object]:
+    return lambda: create_slug(TITLE)
+
+
+def bench_user_response_validate() -> Callable[[], object]:
+    user = build_users(1)[0]
+    return lambda: UserResponse.model_validate(user).model_dump_json()
+
+
+def bench_user_response_orjson() -> Callable[[], object]:
+    user = build_users(1)[0]
+    return lambda: orjson.dumps(dump_entity(user, UserResponse))
+
+
+# Cada fábrica prepara os dados fora da medição e retorna a função medida
+BENCHMARKS: dict[str, Callable[[], Callable[[], object]]] = {
+    "create_access_token": bench_create_access_token,
+    "decode_access_token": bench_decode_access_token,
+    "hash_password": bench_hash_password,
+    "verify_password": bench_verify_password,
+    "create_slug": bench_create_slug,
+    "user_response_validate": bench_user_response_validate,
+    "user_response_orjson": bench_user_response_orjson,
+}
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Melhor tempo por chamada (s); `autorange` calibra as iterações (>= 0,2 s)."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("names", nargs="*", help="benchmarks a executar (padrão: todos)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"benchmarks desconhecidos: {', '.join(sorted(unknown))}")
+
+    results = {}
+    print(f"{'benchmark':<26}{'µs/op':>12}{'ops/s':>12}")
+    for name, factory in BENCHMARKS.items():
+        if args.names and name not in args.names:
+            continue
+        seconds = measure(factory(), args.repeat)
+        results[name] = {"us_per_op": seconds * 1_000_000}
+        print(f"{name:<26}{seconds * 1_000_000:>12.2f}{1 / seconds:>12.0f}")
+
+    sys.exit(report(SUITE, results, args.tolerance, args.update_baseline))
+
+
+if __name__ == "__main__":
+    main()
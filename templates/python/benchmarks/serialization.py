@@ -0,0 +1,90 @@
+"""
+Compara o custo por item de serializar usuários do ORM em JSON.
+
+Uso:
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --items 1000 --rounds 50
+
+Caminhos medidos:
+    validate+jsonable_encoder  FastAPI com `response_class` próprio (e < 0.130)
+    TypeAdapter.dump_json      caminho padrão do FastAPI >= 0.130 (response_model)
+    dump_entities+orjson       `app.common.serialization`, sem revalidação
+"""
+
+import argparse
+import json
+import time
+import uuid
+from collections.abc import Callable
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.auth.enums import Role
+from app.common.serialization import dump_entities, json_response
+from app.user.models import User
+from app.user.schemas import UserResponse
+
+
+def build_users(count: int) -> list[User]:
+    return [
+        User(
+            id=uuid.uuid4(),
+            email=f"user{index}@example.com",
+            name=f"Usuário {index}",
+            phone=None if index % 2 else "+55 11 99999-0000",
+            is_active=True,
+            role=Role.USER,
+            must_change_password=False,
+        )
+        for index in range(count)
+    ]
+
+
+def measure(func: Callable[[], object], rounds: int) -> float:
+    """Melhor tempo (s) entre as rodadas, para reduzir ruído."""
+    func()
+    best = float("inf")
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started_at)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=30)
+    args = parser.parse_args()
+
+    users = build_users(args.items)
+    adapter = TypeAdapter(list[UserResponse])
+
+    def validate_and_encode() -> bytes:
+        items = [UserResponse.model_validate(user) for user in users]
+        return json.dumps(jsonable_encoder(items)).encode()
+
+    def pydantic_dump_json() -> bytes:
+        return adapter.dump_json(adapter.validate_python(users, from_attributes=True))
+
+    def orjson_dump() -> bytes:
+        return json_response(dump_entities(users, UserResponse)).body
+
+    assert json.loads(validate_and_encode()) == json.loads(orjson_dump())
+
+    paths = {
+        "validate+jsonable_encoder": validate_and_encode,
+        "TypeAdapter.dump_json": pydantic_dump_json,
+        "dump_entities+orjson": orjson_dump,
+    }
+    baseline = None
+    print(f"{'caminho':<28}{'µs/item':>10}{'speedup':>10}")
+    for name, func in paths.items():
+        per_item = measure(func, args.rounds) / args.items * 1_000_000
+        baseline = baseline or per_item
+        print(f"{name:<28}{per_item:>10.2f}{baseline / per_item:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
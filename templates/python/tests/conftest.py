@@ -0,0 +1,3 @@
+# Os pacotes `app.auth` e `app.user` importam um ao outro; carregar a aplicação
+# primeiro reproduz a ordem de importação do servidor
+import app.main  # noqa: F401
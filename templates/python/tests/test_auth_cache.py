@@ -0,0 +1,129 @@
+import uuid
+from collections.abc import Iterator
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import dependencies
+from app.auth.cache import invalidate_user, user_cache
+from app.auth.dependencies import create_access_token, get_current_user
+from app.auth.enums import Role
+from app.common.errors import ERRORS
+from app.user.models import User
+
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+class FakeSession(AsyncSession):
+    """Sessão sem banco: `get` lê de um dicionário; commit e rollback disparam os eventos."""
+
+    def __init__(self, users: dict[uuid.UUID, User]):
+        super().__init__()
+        self.users = users
+        self.loads = 0
+
+    async def get(self, model, ident, **kwargs):
+        self.loads += 1
+        return self.users.get(ident)
+
+
+@pytest.fixture
+def user(monkeypatch) -> Iterator[User]:
+    monkeypatch.setattr(dependencies.settings, "AUTH_STATELESS", False)
+    user_cache.clear()
+    yield User(
+        id=USER_ID,
+        email="ana@x.com",
+        name="Ana",
+        role=Role.USER,
+        is_active=True,
+        must_change_password=False,
+        token_version=0,
+        deleted_at=None,
+    )
+    user_cache.clear()
+
+
+def credentials(token_version: int = 0) -> HTTPAuthorizationCredentials:
+    token = create_access_token(USER_ID, "ana@x.com", "user", token_version=token_version)
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+async def test_cached_user_skips_the_database(user):
+    db = FakeSession({USER_ID: user})
+
+    first = await get_current_user(credentials(), db)
+    second = await get_current_user(credentials(), db)
+
+    assert first == second
+    assert db.loads == 1
+
+
+async def test_invalidate_user_evicts_again_after_commit(user):
+    db = FakeSession({USER_ID: user})
+    await get_current_user(credentials(), db)
+
+    invalidate_user(db, USER_ID)
+    assert user_cache.get(USER_ID) is None
+
+    # Requisição concorrente recoloca no cache o estado anterior ao commit
+    await get_current_user(credentials(), FakeSession({USER_ID: user}))
+    assert user_cache.get(USER_ID) is not None
+
+    await db.commit()
+    assert user_cache.get(USER_ID) is None
+
+
+async def test_rollback_discards_pending_invalidation(user):
+    db = FakeSession({USER_ID: user})
+    await db.begin()
+    invalidate_user(db, USER_ID)
+    await db.rollback()
+
+    await get_current_user(credentials(), db)
+    await db.commit()
+    assert user_cache.get(USER_ID) is not None
+
+
+@pytest.mark.parametrize(
+    ("changes", "error"),
+    [
+        ({"is_active": False}, "ACCOUNT_DISABLED"),
+        ({"deleted_at": datetime(2024, 1, 1, tzinfo=UTC)}, "ACCOUNT_DELETED"),
+    ],
+)
+async def test_disabled_user_is_rejected_after_commit(user, changes, error):
+    db = FakeSession({USER_ID: user})
+    await get_current_user(credentials(), db)
+
+    for key, value in changes.items():
+        setattr(user, key, value)
+    invalidate_user(db, USER_ID)
+    await db.commit()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(credentials(), db)
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.detail == ERRORS["AUTH"][error]
+
+
+async def test_token_older_than_cached_version_is_revoked(user):
+    user.token_version = 2
+    db = FakeSession({USER_ID: user})
+
+    assert (await get_current_user(credentials(2), db)).token_version == 2
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(credentials(1), db)
+
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.detail == ERRORS["AUTH"]["TOKEN_REVOKED"]
+    assert db.loads == 1
+
+
+async def test_unknown_user_is_rejected(user):
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(credentials(), FakeSession({}))
+    assert exc_info.value.status_code == 401
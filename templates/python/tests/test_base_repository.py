@@ -0,0 +1,97 @@
+from collections.abc import Iterator
+from datetime import datetime
+
+import pytest
+from sqlalchemy import DateTime, String, create_engine, event, func, update
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from app.common.base_model import BaseModel
+from app.common.base_repository import BaseRepository
+
+
+class Item(BaseModel):
+    __tablename__ = "test_repository_items"
+
+    name: Mapped[str] = mapped_column(String, unique=True)
+    note: Mapped[str | None] = mapped_column(String, nullable=True)
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class SyncSessionAdapter:
+    """Expõe `scalars` de uma sessão síncrona (SQLite) com a assinatura da AsyncSession."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def scalars(self, statement, params=None, **kwargs):
+        return self.session.scalars(statement, params, **kwargs)
+
+
+@pytest.fixture
+def statements() -> list[str]:
+    return []
+
+
+@pytest.fixture
+def session(statements) -> Iterator[Session]:
+    # O SQLite também entende INSERT ... ON CONFLICT e UPDATE ... RETURNING
+    engine = create_engine("sqlite://")
+    Item.__table__.create(engine)
+    event.listen(
+        engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql)
+    )
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def repo(session) -> BaseRepository[Item]:
+    return BaseRepository(Item, SyncSessionAdapter(session))
+
+
+async def test_create_if_not_exists_returns_row_or_none(repo, session, statements):
+    item = await repo.create_if_not_exists({"name": "a"}, conflict_columns=("name",))
+
+    [sql] = statements
+    assert "ON CONFLICT (name) DO NOTHING RETURNING" in sql
+
+    assert item.id is not None
+    assert item.created_at is not None
+    assert session.get(Item, item.id) is item
+    assert await repo.create_if_not_exists({"name": "a"}, conflict_columns=("name",)) is None
+
+
+async def test_update_refreshes_loaded_instance(repo, session, statements):
+    item = await repo.create({"name": "a", "note": "antiga"})
+    # Muda a linha por fora do ORM: a instância carregada fica desatualizada
+    session.execute(update(Item).where(Item.id == item.id).values(note="externa"))
+    statements.clear()
+
+    updated = await repo.update(item.id, {"name": "b"})
+
+    [sql] = statements
+    assert sql.startswith("UPDATE") and "RETURNING" in sql
+
+    assert updated is item
+    assert item.name == "b"
+    assert item.note == "externa"
+
+
+async def test_update_skips_none_unless_asked(repo):
+    item = await repo.create({"name": "a", "note": "nota"})
+
+    await repo.update(item.id, {"note": None})
+    assert item.note == "nota"
+
+    await repo.update(item.id, {"note": None}, skip_none=False)
+    assert item.note is None
+
+
+async def test_update_soft_deleted_rows_is_opt_out(repo, session):
+    item = await repo.create({"name": "a"})
+    session.execute(update(Item).where(Item.id == item.id).values(deleted_at=func.now()))
+
+    assert await repo.update(item.id, {"name": "b"}, include_deleted=False) is None
+    assert (await repo.update(item.id, {"name": "c"})).name == "c"
+    assert item.deleted_at is not None
@@ -0,0 +1,37 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.common.base_repository import _Explain, _statement_signature
+from app.user.models import User
+
+
+def search(term: str):
+    return select(User.id).where(User.name.ilike(f"%{term}%"))
+
+
+def test_explain_keeps_search_term_as_bind_parameter():
+    compiled = _Explain(search("o'brien")).compile(dialect=asyncpg.dialect())
+
+    assert str(compiled).startswith("EXPLAIN (FORMAT JSON) SELECT users.id")
+    assert "brien" not in str(compiled)
+    assert list(compiled.params.values()) == ["%o'brien%"]
+
+
+def test_explain_counts_as_read():
+    assert _Explain(search("ana")).is_select
+
+
+def test_explain_cache_key_ignores_parameter_values():
+    first = _Explain(search("ana"))._generate_cache_key()
+    second = _Explain(search("bia"))._generate_cache_key()
+
+    assert first.key == second.key
+    assert [bind.value for bind in second.bindparams] == ["%bia%"]
+
+
+def test_count_signature_is_a_digest_of_sql_and_parameters():
+    signature = _statement_signature(search("segredo"))
+
+    assert "segredo" not in signature
+    assert signature == _statement_signature(search("segredo"))
+    assert signature != _statement_signature(search("outro"))
@@ -0,0 +1,64 @@
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth.enums import Role
+from app.common import cursor as cursor_module
+from app.common.cursor import _b64decode, _b64encode, decode_cursor, encode_cursor
+
+ROW_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+def assert_invalid(cursor: str, sort_by: str = "created_at", sort_order: str = "desc") -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, sort_by, sort_order)
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "value", [datetime(2024, 5, 1, 12, 30, tzinfo=UTC), uuid.uuid4(), "Ana", 42, None]
+)
+def test_round_trip(value):
+    cursor = encode_cursor("created_at", "desc", value, ROW_ID)
+    assert decode_cursor(cursor, "created_at", "DESC") == (value, ROW_ID)
+
+
+def test_enum_is_encoded_by_member_name():
+    cursor = encode_cursor("role", "asc", Role.ADMIN, ROW_ID)
+    assert decode_cursor(cursor, "role", "asc") == (Role.ADMIN.name, ROW_ID)
+
+
+def test_tampered_payload_is_rejected():
+    cursor = encode_cursor("name", "asc", "Ana", ROW_ID)
+    payload, signature = cursor.split(".")
+    forged = _b64decode(payload).replace(b"Ana", b"Bia")
+
+    assert_invalid(f"{_b64encode(forged)}.{signature}", "name", "asc")
+
+
+def test_tampered_signature_is_rejected():
+    payload, signature = encode_cursor("name", "asc", "Ana", ROW_ID).split(".")
+    flipped = ("B" if signature[0] == "A" else "A") + signature[1:]
+
+    assert_invalid(f"{payload}.{flipped}", "name", "asc")
+
+
+def test_cursor_from_other_ordering_is_rejected():
+    cursor = encode_cursor("created_at", "desc", datetime.now(UTC), ROW_ID)
+
+    assert_invalid(cursor, "created_at", "asc")
+    assert_invalid(cursor, "name", "desc")
+
+
+def test_cursor_signed_with_other_secret_is_rejected(monkeypatch):
+    cursor = encode_cursor("created_at", "desc", datetime.now(UTC), ROW_ID)
+    monkeypatch.setattr(cursor_module.settings, "PAGINATION_CURSOR_SECRET", "outro-segredo")
+
+    assert_invalid(cursor)
+
+
+@pytest.mark.parametrize("cursor", ["", "semponto", "a.b", "!!!.###"])
+def test_malformed_cursor_is_rejected(cursor):
+    assert_invalid(cursor)
@@ -0,0 +1,90 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from starlette.requests import Request
+
+from app.auth.schemas import UserOut
+from app.common.etag import (
+    collection_etag,
+    entity_etag,
+    is_not_modified,
+    last_modified_of,
+    not_modified,
+)
+
+UPDATED_AT = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=UTC)
+HTTP_DATE = "Wed, 01 May 2024 12:30:15 GMT"
+
+
+def make_request(**headers: str) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "headers": raw})
+
+
+def entity(updated_at: datetime = UPDATED_AT) -> SimpleNamespace:
+    return SimpleNamespace(id=uuid.UUID(int=1), updated_at=updated_at)
+
+
+def test_entity_etag_changes_with_version_and_schema():
+    etag = entity_etag(entity(), UserOut)
+
+    assert etag.startswith('W/"')
+    assert etag == entity_etag(entity(), UserOut)
+    assert etag != entity_etag(entity(UPDATED_AT + timedelta(seconds=1)), UserOut)
+
+
+def test_collection_etag_reflects_removed_items():
+    first, second = entity(), SimpleNamespace(id=uuid.UUID(int=2), updated_at=UPDATED_AT)
+
+    assert collection_etag([first, second], UserOut, "q") != collection_etag([first], UserOut, "q")
+    assert collection_etag([first], UserOut, "q") != collection_etag([first], UserOut, "outra")
+    assert last_modified_of([first, second]) == UPDATED_AT
+    assert last_modified_of([]) is None
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ('W/"abc"', True),
+        ('"abc"', True),
+        ('"x", W/"abc"', True),
+        ("*", True),
+        ('W/"outro"', False),
+    ],
+)
+def test_if_none_match(header, expected):
+    assert is_not_modified(make_request(if_none_match=header), 'W/"abc"') is expected
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    request = make_request(if_none_match='W/"outro"', if_modified_since=HTTP_DATE)
+    assert not is_not_modified(request, 'W/"abc"', UPDATED_AT)
+
+
+def test_if_modified_since_ignores_sub_second_precision():
+    request = make_request(if_modified_since=HTTP_DATE)
+
+    assert is_not_modified(request, 'W/"abc"', UPDATED_AT)
+    assert not is_not_modified(request, 'W/"abc"', UPDATED_AT + timedelta(seconds=1))
+    # Sem data da entidade (listagens), a data do cliente não basta
+    assert not is_not_modified(request, 'W/"abc"', None)
+
+
+def test_if_modified_since_accepts_naive_datetimes():
+    naive = UPDATED_AT.replace(tzinfo=None)
+    assert is_not_modified(make_request(if_modified_since=HTTP_DATE), 'W/"abc"', naive)
+
+
+def test_invalid_if_modified_since_is_ignored():
+    assert not is_not_modified(make_request(if_modified_since="ontem"), 'W/"abc"', UPDATED_AT)
+
+
+def test_not_modified_response_keeps_validators():
+    response = not_modified('W/"abc"', UPDATED_AT.replace(tzinfo=None))
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == 'W/"abc"'
+    assert response.headers["last-modified"] == HTTP_DATE
+    assert response.headers["cache-control"] == "private, no-cache"
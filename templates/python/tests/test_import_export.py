@@ -0,0 +1,106 @@
+import csv
+import io
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth.enums import Role
+from app.common.export import ExportFormat, ImportFileError, iter_import_rows
+from app.user import service as user_service
+from app.user.repository import UserRepository
+
+
+def rows(content: bytes, import_format: ExportFormat) -> list:
+    return list(iter_import_rows(io.BytesIO(content), import_format))
+
+
+def test_csv_rows_skip_empty_fields_and_bom():
+    content = "﻿email,name,phone\r\na@x.com,Ana,\r\nb@x.com,Bia,123\r\n".encode()
+    assert rows(content, ExportFormat.CSV) == [
+        (2, {"email": "a@x.com", "name": "Ana"}, None),
+        (3, {"email": "b@x.com", "name": "Bia", "phone": "123"}, None),
+    ]
+
+
+def test_csv_quoted_field_spanning_lines():
+    content = b'email,name\na@x.com,"Ana\nMaria"\n'
+    expected = [(3, {"email": "a@x.com", "name": "Ana\nMaria"}, None)]
+    assert rows(content, ExportFormat.CSV) == expected
+
+
+def test_csv_invalid_encoding_raises_with_line():
+    with pytest.raises(ImportFileError) as exc_info:
+        rows(b"email,name\na@x.com,Ana\n\xff\xfe,x\n", ExportFormat.CSV)
+    assert exc_info.value.line == 3
+
+
+def test_csv_field_over_size_limit_raises():
+    limit = csv.field_size_limit(10)
+    try:
+        with pytest.raises(ImportFileError):
+            rows(b"email,name\na@x.com," + b"a" * 100 + b"\n", ExportFormat.CSV)
+    finally:
+        csv.field_size_limit(limit)
+
+
+def test_ndjson_reports_bad_lines_and_continues():
+    content = b'{"email": "a@x.com"}\n\xff\xfe\n\nnot json\n[1]\n{"email": "b@x.com"}\n'
+    result = rows(content, ExportFormat.NDJSON)
+    assert [(line, data) for line, data, _ in result] == [
+        (1, {"email": "a@x.com"}),
+        (2, None),
+        (4, None),
+        (5, None),
+        (6, {"email": "b@x.com"}),
+    ]
+    assert result[1][2] == "Codificação inválida (esperado UTF-8)"
+
+
+@pytest.fixture
+def created_rows(monkeypatch) -> list[dict]:
+    created: list[dict] = []
+
+    async def bulk_create(self, rows, conflict_columns=()):
+        created.extend(rows)
+        return rows
+
+    async def hash_password_async(password: str) -> str:
+        return "hash"
+
+    monkeypatch.setattr(UserRepository, "bulk_create", bulk_create)
+    monkeypatch.setattr(user_service, "hash_password_async", hash_password_async)
+    return created
+
+
+async def test_import_users_reports_row_errors(created_rows):
+    content = b'{"email": "a@x.com", "name": "Ana"}\n\xff\n{"email": "invalido"}\n'
+    report = await user_service.import_users(None, io.BytesIO(content), ExportFormat.NDJSON)
+
+    assert report.created == 1
+    assert report.total_errors == 2
+    assert [error.line for error in report.errors] == [2, 3]
+    assert created_rows[0]["must_change_password"] is True
+
+
+async def test_import_users_null_fields_use_defaults(created_rows):
+    content = (
+        b'{"email": "a@x.com", "name": "Ana", "role": "admin"}\n'
+        b'{"email": "b@x.com", "name": "Bia", "role": null, "is_active": null}\n'
+        b'{"email": "c@x.com", "name": "Caio"}\n'
+    )
+    report = await user_service.import_users(None, io.BytesIO(content), ExportFormat.NDJSON)
+
+    assert report.created == 3
+    assert report.total_errors == 0
+    # O INSERT multi-linha exige as mesmas colunas em todas as linhas
+    assert len({tuple(sorted(row)) for row in created_rows}) == 1
+    assert created_rows[1]["role"] == Role.USER
+    assert created_rows[1]["is_active"] is True
+
+
+async def test_import_users_invalid_csv_is_bad_request(created_rows):
+    content = b"email,name\na@x.com,Ana\n\xff\xfe,x\n"
+    with pytest.raises(HTTPException) as exc_info:
+        await user_service.import_users(None, io.BytesIO(content), ExportFormat.CSV)
+    assert exc_info.value.status_code == 400
+    assert "linha 3" in exc_info.value.detail
@@ -0,0 +1,190 @@
+import asyncio
+import multiprocessing
+from collections.abc import Iterator
+
+import pytest
+from fastapi import Depends, HTTPException
+from fastapi.testclient import TestClient
+
+from app.auth import rate_limit
+from app.auth import service as auth_service
+from app.auth.dependencies import (
+    create_access_token,
+    decode_access_token,
+    get_current_user,
+    security,
+)
+from app.auth.rate_limit import (
+    MemoryRateLimitBackend,
+    Rate,
+    RateLimiter,
+    SQLiteRateLimitBackend,
+)
+from app.auth.schemas import CurrentUser
+from app.main import app
+
+
+def test_rate_parse():
+    assert Rate.parse("10/minute") == Rate(10, 60)
+    assert Rate.parse(" 5/second ") == Rate(5, 1)
+    assert Rate.parse("") is None
+    assert Rate.parse("0/hour") is None
+    for value in ("10/day", "dez/minute", "10"):
+        with pytest.raises(ValueError):
+            Rate.parse(value)
+
+
+async def test_memory_backend_refills_over_time():
+    backend = MemoryRateLimitBackend()
+    limits = [("k", Rate(2, 0.1))]
+
+    assert await backend.acquire(limits) == [0.0]
+    assert await backend.acquire(limits) == [0.0]
+    [wait] = await backend.acquire(limits)
+    assert 0 < wait <= 0.05
+
+    await asyncio.sleep(wait + 0.01)
+    assert await backend.acquire(limits) == [0.0]
+
+
+async def test_rejected_request_consumes_no_tokens():
+    backend = MemoryRateLimitBackend()
+    ip, email = ("ip", Rate(3, 60)), ("email", Rate(1, 60))
+
+    assert not any(await backend.acquire([ip, email]))
+    # O bucket do e-mail recusa; o do IP não pode ser gasto por isso
+    for _ in range(5):
+        assert any(await backend.acquire([ip, email]))
+    assert not any(await backend.acquire([ip]))
+    assert not any(await backend.acquire([ip]))
+    assert any(await backend.acquire([ip]))
+
+
+def _acquire_many(path: str, attempts: int, queue) -> None:
+    async def run() -> int:
+        backend = SQLiteRateLimitBackend(path)
+        try:
+            allowed = 0
+            for _ in range(attempts):
+                allowed += not any(await backend.acquire([("shared", Rate(50, 60))]))
+            return allowed
+        finally:
+            await backend.close()
+
+    queue.put(asyncio.run(run()))
+
+
+def test_sqlite_backend_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "rate-limit.sqlite3")
+    queue = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_acquire_many, args=(path, 40, queue)) for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+
+    assert sum(queue.get(timeout=5) for _ in processes) == 50
+
+
+async def test_limiter_raises_429_with_retry_after(monkeypatch):
+    monkeypatch.setattr(rate_limit.settings, "RATE_LIMIT_ENABLED", True)
+    limiter = RateLimiter(MemoryRateLimitBackend())
+    limiter.rates = {"login_ip": Rate(1, 30), "global": None}
+
+    await limiter.check(("login_ip", "10.0.0.1"))
+    with pytest.raises(HTTPException) as exc_info:
+        await limiter.check(("login_ip", "10.0.0.1"))
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers == {"Retry-After": "30"}
+    assert limiter.rejected == {"login_ip": 1}
+    # Outro IP tem o próprio bucket
+    await limiter.check(("login_ip", "10.0.0.2"))
+
+
+@pytest.fixture
+def limiter(monkeypatch) -> RateLimiter:
+    limiter = RateLimiter(MemoryRateLimitBackend())
+    limiter.rates = {
+        "login_ip": Rate(5, 60),
+        "login_email": Rate(3, 60),
+        "change_password_ip": Rate(10, 60),
+        "change_password_user": Rate(1, 60),
+        "global": None,
+    }
+    monkeypatch.setattr(rate_limit, "rate_limiter", limiter)
+    monkeypatch.setattr(rate_limit.settings, "RATE_LIMIT_ENABLED", True)
+    return limiter
+
+
+@pytest.fixture
+def client(limiter) -> Iterator[TestClient]:
+    # Autenticação só pelo token, sem consultar o banco
+    def current_user(credentials=Depends(security)) -> CurrentUser:
+        payload = decode_access_token(credentials.credentials)
+        return CurrentUser(
+            id=payload["sub"], email=payload["email"], role=payload["role"], is_active=True
+        )
+
+    app.dependency_overrides[get_current_user] = current_user
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def login_calls(monkeypatch) -> list[str]:
+    calls: list[str] = []
+
+    async def login(db, email: str, password: str):
+        calls.append(email)
+        raise HTTPException(status_code=401, detail="credenciais")
+
+    monkeypatch.setattr(auth_service, "login", login)
+    return calls
+
+
+def test_login_is_limited_before_the_service(client, login_calls):
+    codes = [
+        client.post("/auth/login", json={"email": "Ana@x.com", "password": "x"}).status_code
+        for _ in range(4)
+    ]
+    response = client.post("/auth/login", json={"email": "ana@x.com", "password": "x"})
+
+    assert codes == [401, 401, 401, 429]
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+    # Recusadas não chegam ao serviço (nem ao banco ou ao hashing)
+    assert len(login_calls) == 3
+
+
+def test_login_is_limited_per_ip(client, limiter, login_calls):
+    codes = [
+        client.post("/auth/login", json={"email": f"u{i}@x.com", "password": "x"}).status_code
+        for i in range(6)
+    ]
+
+    assert codes == [401] * 5 + [429]
+    assert limiter.stats()["rejected"] == {"login_ip": 1}
+
+
+def test_change_password_is_limited_per_token_subject(client, monkeypatch):
+    async def change_password(db, user_id, data):
+        return {"message": "ok"}
+
+    monkeypatch.setattr(auth_service, "change_password", change_password)
+    token = create_access_token("00000000-0000-0000-0000-000000000001", "a@x.com", "user")
+    body = {"old_password": "antiga-123", "new_password": "nova-senha-123"}
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = client.patch("/auth/change-password", json=body, headers=headers)
+    second = client.patch("/auth/change-password", json=body, headers=headers)
+    invalid = client.patch(
+        "/auth/change-password", json=body, headers={"Authorization": "Bearer invalido"}
+    )
+
+    assert second.status_code == 429
+    assert first.status_code != 429
+    # Token inválido não tem bucket de usuário e é recusado pela autenticação
+    assert invalid.status_code == 401
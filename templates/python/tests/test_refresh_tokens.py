@@ -0,0 +1,111 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth import service as auth_service
+from app.auth import token_store
+from app.auth.enums import Role
+from app.auth.service import digest_refresh_token, refresh_tokens
+from app.auth.token_store import MemoryRefreshTokenStore
+from app.user.models import User
+
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+def in_days(days: float) -> datetime:
+    return datetime.now(UTC) + timedelta(days=days)
+
+
+async def test_consume_only_once():
+    store = MemoryRefreshTokenStore()
+    await store.save("jti", USER_ID, "digest", in_days(1))
+
+    record = await store.consume("jti", "digest")
+
+    assert record is not None
+    assert record.user_id == USER_ID
+    assert await store.consume("jti", "digest") is None
+
+
+async def test_consume_rejects_wrong_digest_and_expired():
+    store = MemoryRefreshTokenStore()
+    await store.save("jti", USER_ID, "digest", in_days(1))
+    await store.save("expirado", USER_ID, "digest", in_days(-1))
+
+    assert await store.consume("jti", "outro") is None
+    assert await store.consume("expirado", "digest") is None
+    # Um digest errado não revoga o token verdadeiro
+    assert await store.consume("jti", "digest") is not None
+
+
+async def test_revoke_all_only_affects_the_user():
+    store = MemoryRefreshTokenStore()
+    other_id = uuid.uuid4()
+    await store.save("a", USER_ID, "d", in_days(1))
+    await store.save("b", USER_ID, "d", in_days(1))
+    await store.save("c", other_id, "d", in_days(1))
+
+    await store.revoke_all(USER_ID)
+
+    assert await store.consume("a", "d") is None
+    assert await store.consume("b", "d") is None
+    assert await store.consume("c", "d") is not None
+
+
+def test_digest_is_keyed_and_deterministic(monkeypatch):
+    digest = digest_refresh_token("token")
+
+    assert digest == digest_refresh_token("token")
+    assert len(digest) == 64
+    monkeypatch.setattr(auth_service.settings, "JWT_REFRESH_DIGEST_SECRET", "outro-segredo")
+    assert digest_refresh_token("token") != digest
+
+
+class FakeSession:
+    def __init__(self, user: User):
+        self.user = user
+
+    async def get(self, model, id):
+        return self.user if id == self.user.id else None
+
+
+@pytest.fixture
+def db(monkeypatch) -> FakeSession:
+    monkeypatch.setattr(token_store.settings, "REFRESH_TOKEN_STORE", "memory")
+    monkeypatch.setattr(token_store, "_shared_store", None)
+    user = User(
+        id=USER_ID,
+        email="ana@x.com",
+        name="Ana",
+        role=Role.USER,
+        is_active=True,
+        must_change_password=False,
+        token_version=0,
+    )
+    return FakeSession(user)
+
+
+async def test_refresh_rotates_and_rejects_reuse(db):
+    first = await auth_service.generate_auth_response(db, db.user)
+
+    second = await refresh_tokens(db, first.refresh_token)
+    assert second.refresh_token != first.refresh_token
+
+    # O token antigo já foi consumido
+    with pytest.raises(HTTPException) as exc_info:
+        await refresh_tokens(db, first.refresh_token)
+    assert exc_info.value.status_code == 403
+
+    third = await refresh_tokens(db, second.refresh_token)
+    assert third.user.id == USER_ID
+
+
+async def test_refresh_rejects_token_from_older_version(db):
+    response = await auth_service.generate_auth_response(db, db.user)
+    db.user.token_version = 1
+
+    with pytest.raises(HTTPException) as exc_info:
+        await refresh_tokens(db, response.refresh_token)
+    assert exc_info.value.status_code == 403
@@ -0,0 +1,163 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import dependencies, revocation
+from app.auth.dependencies import create_access_token, get_current_user
+from app.auth.revocation import TokenVersionDenylist, revoke_user_tokens
+from app.common.errors import ERRORS
+
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+class FakeResult:
+    def __init__(self, rows: list):
+        self.rows = rows
+
+    def all(self) -> list:
+        return self.rows
+
+
+class FakeSession(AsyncSession):
+    """Sessão sem banco: registra as queries; commit e rollback disparam os eventos."""
+
+    def __init__(self, rows: list | None = None):
+        super().__init__()
+        self.rows = rows or []
+        self.statements: list = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return FakeResult(self.rows)
+
+    async def get(self, *args, **kwargs):
+        raise AssertionError("o modo stateless não consulta a tabela users")
+
+
+def since_param(statement) -> datetime:
+    [since] = [v for v in statement.compile().params.values() if isinstance(v, datetime)]
+    return since
+
+
+@pytest.fixture
+def denylist(monkeypatch) -> TokenVersionDenylist:
+    denylist = TokenVersionDenylist(sync_seconds=5, retention_seconds=900)
+    monkeypatch.setattr(revocation, "token_denylist", denylist)
+    monkeypatch.setattr(dependencies, "token_denylist", denylist)
+    return denylist
+
+
+def test_is_revoked_keeps_the_highest_version(denylist):
+    other_id = uuid.uuid4()
+    denylist.record(USER_ID, 2)
+    denylist.record(USER_ID, 1)
+
+    assert denylist.is_revoked(USER_ID, 1)
+    assert not denylist.is_revoked(USER_ID, 2)
+    assert not denylist.is_revoked(other_id, 0)
+
+
+async def test_revoke_user_tokens_records_only_after_commit(denylist):
+    db = FakeSession()
+    user = SimpleNamespace(id=USER_ID, token_version=3)
+
+    revoke_user_tokens(db, user)
+
+    assert user.token_version == 4
+    assert not denylist.is_revoked(USER_ID, 3)
+    await db.commit()
+    assert denylist.is_revoked(USER_ID, 3)
+
+
+async def test_rollback_discards_pending_revocation(denylist):
+    db = FakeSession()
+    await db.begin()
+    revoke_user_tokens(db, SimpleNamespace(id=USER_ID, token_version=0))
+    await db.rollback()
+
+    await db.commit()
+    assert not denylist.is_revoked(USER_ID, 0)
+
+
+async def test_sync_reads_other_nodes_within_window_and_margin(denylist):
+    db = FakeSession(rows=[(USER_ID, 2)])
+    before = datetime.now(UTC)
+
+    await denylist.sync(db)
+
+    margin = timedelta(seconds=denylist.sync_seconds * 2)
+    since = since_param(db.statements[0])
+    assert before - timedelta(seconds=900) - margin - since < timedelta(seconds=1)
+    assert denylist.is_revoked(USER_ID, 1)
+
+    # Dentro do intervalo de sincronização não há nova query
+    await denylist.sync(db)
+    assert len(db.statements) == 1
+
+    synced_until = denylist._synced_until
+    denylist._next_sync_at = 0.0
+    await denylist.sync(db)
+    # A janela seguinte começa na anterior, recuada pela margem de relógio
+    assert since_param(db.statements[1]) == synced_until - margin
+
+
+async def test_entries_older_than_retention_are_pruned(denylist):
+    denylist.retention_seconds = 0
+    denylist.record(USER_ID, 2)
+
+    await denylist.sync(FakeSession())
+
+    assert not denylist.is_revoked(USER_ID, 1)
+
+
+@pytest.fixture
+def stateless(monkeypatch, denylist) -> TokenVersionDenylist:
+    monkeypatch.setattr(dependencies.settings, "AUTH_STATELESS", True)
+    return denylist
+
+
+def credentials(is_active: bool = True, token_version: int = 0) -> HTTPAuthorizationCredentials:
+    token = create_access_token(
+        USER_ID, "ana@x.com", "user", is_active=is_active, token_version=token_version
+    )
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+async def test_stateless_user_comes_from_claims(stateless):
+    current_user = await get_current_user(credentials(token_version=1), FakeSession())
+
+    assert current_user.id == USER_ID
+    assert current_user.email == "ana@x.com"
+    assert current_user.token_version == 1
+
+
+async def test_stateless_rejects_inactive_claim(stateless):
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(credentials(is_active=False), FakeSession())
+
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.detail == ERRORS["AUTH"]["ACCOUNT_DISABLED"]
+
+
+async def test_stateless_rejects_revoked_version(stateless):
+    db = FakeSession()
+    revoke_user_tokens(db, SimpleNamespace(id=USER_ID, token_version=0))
+    await db.commit()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(credentials(token_version=0), FakeSession())
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.detail == ERRORS["AUTH"]["TOKEN_REVOKED"]
+
+    assert (await get_current_user(credentials(token_version=1), FakeSession())).id == USER_ID
+
+
+async def test_stateless_rejects_version_revoked_on_other_node(stateless):
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(credentials(token_version=0), FakeSession(rows=[(USER_ID, 1)]))
+    assert exc_info.value.detail == ERRORS["AUTH"]["TOKEN_REVOKED"]